@@ -146,6 +146,12 @@ DATABASES = {
 }
 DATABASES['default']['ATOMIC_REQUESTS'] = True
 
+# Rows per INSERT statement for bulk loads
+BULK_CREATE_BATCH_SIZE = int(env('OPENEDGAR_BULK_CREATE_BATCH_SIZE', default=1000))
+
+# Load high-volume rows with COPY through a staging table instead of multi-row INSERTs; PostgreSQL only
+BULK_INSERT_USE_COPY = env.bool('OPENEDGAR_BULK_INSERT_USE_COPY', default=False)
+
 # GENERAL CONFIGURATION
 # ------------------------------------------------------------------------------
 # Local time zone for this installation. Choices can be found here:
@@ -300,7 +306,8 @@ AUTOSLUG_SLUGIFY_FUNCTION = 'slugify.slugify'
 ########## CELERY
 INSTALLED_APPS += ['sec_openedgar.taskapp.celery.CeleryConfig']
 CELERY_BROKER_URL = env('CELERY_BROKER_URL', default='django://')
-CELERY_RESULT_BACKEND = 'rpc'
+# process_filing_index(parallel=True) dispatches chords, which need a backend such as redis:// rather than rpc
+CELERY_RESULT_BACKEND = env('CELERY_RESULT_BACKEND', default='rpc')
 CELERY_RESULT_PERSISTENT = False
 
 #: Only add pickle to this list if your broker is secured
@@ -323,10 +330,21 @@ MODEL_PATH = pathlib.Path(BASE_PATH, "model")
 # HTTP configuration
 HTTP_SEC_HOST = "https://www.sec.gov"
 HTTP_SEC_INDEX_PATH = "/Archives/edgar/daily-index/"
+HTTP_SEC_FULL_INDEX_PATH = "/Archives/edgar/full-index/"
 HTTP_SEC_FILING_PATH = "/Archives/"
 HTTP_SEC_LOCAL_PATH = pathlib.Path(DATA_PATH, "sec-http")
 HTTP_FAIL_SLEEP = [15, 30, 60, 300]
-HTTP_SLEEP_DEFAULT = 0.0
+HTTP_RATE_LIMIT = 9.0
+HTTP_RATE_BURST = 10
+# Number of processes sharing the rate limit, e.g., Celery workers x concurrency; each paces itself to its share
+HTTP_RATE_PROCESSES = max(1, int(env('OPENEDGAR_HTTP_RATE_PROCESSES', default=1)))
+HTTP_TIMEOUT = (5, 30)
+HTTP_POOL_CONNECTIONS = 32
+HTTP_POOL_MAXSIZE = 64
+HTTP_MAX_WORKERS = 8
+HTTP_INDEX_MAX_WORKERS = 4
+HTTP_PIPELINE_QUEUE_SIZE = 4
+HTTP_CHUNK_SIZE = 131072
 
 # S3 bucket configuration
 S3_ACCESS_KEY = env('S3_ACCESS_KEY', default="")
@@ -335,6 +353,11 @@ S3_BUCKET = env('S3_BUCKET', default="")
 S3_DOCUMENT_PATH = env('S3_DOCUMENT_PATH', default="openedgar")
 S3_PREFIX = env('S3_PREFIX', default="documents")
 S3_COMPRESSION_LEVEL = int(env('S3_COMPRESSION_LEVEL', default=6))
+S3_CHUNK_SIZE = int(env('S3_CHUNK_SIZE', default=65536))
+S3_MAX_WORKERS = int(env('S3_MAX_WORKERS', default=16))
+S3_MULTIPART_THRESHOLD = int(env('S3_MULTIPART_THRESHOLD', default=8 * 1024 * 1024))
+S3_MULTIPART_CHUNKSIZE = int(env('S3_MULTIPART_CHUNKSIZE', default=8 * 1024 * 1024))
+S3_TRANSFER_CONCURRENCY = int(env('S3_TRANSFER_CONCURRENCY', default=10))
 
 # Tika configuration
 TIKA_HOST = "localhost"
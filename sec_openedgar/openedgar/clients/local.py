@@ -23,6 +23,7 @@ SOFTWARE.
 # Libraries
 import logging
 import os
+import shutil
 
 # Setup logger
 logger = logging.getLogger(__name__)
@@ -56,3 +57,13 @@ class LocalClient:
     def get_buffer(self, file_path: str):
         with open(file_path, mode='rb') as localfile:
             return localfile.read()
+
+    def get_buffer_if_exists(self, file_path: str):
+        try:
+            return self.get_buffer(file_path)
+        except FileNotFoundError:
+            return None
+
+    def download_to_fileobj(self, file_path: str, fileobj):
+        with open(file_path, mode='rb') as localfile:
+            shutil.copyfileobj(localfile, fileobj)
@@ -23,20 +23,33 @@ SOFTWARE.
 """
 
 # Libraries
+import concurrent.futures
+import datetime
+import functools
+import hashlib
 import logging
+import queue
+import random
+import re
+import threading
 import urllib.parse
 import time
 
 # Packages
 import dateutil.parser
 import lxml.html
+import pandas
+import pyarrow
 import requests
+import requests.adapters
 import edgar
 
 # Project
-from typing import Union
+from typing import Iterable, Tuple, Union
 
-from config.settings.base import HTTP_SEC_HOST, HTTP_FAIL_SLEEP, HTTP_SEC_INDEX_PATH, HTTP_SLEEP_DEFAULT, EDGAR_IDENTITY
+from config.settings.base import HTTP_SEC_HOST, HTTP_FAIL_SLEEP, HTTP_SEC_INDEX_PATH, HTTP_SEC_FULL_INDEX_PATH, \
+    HTTP_RATE_LIMIT, HTTP_RATE_BURST, HTTP_RATE_PROCESSES, HTTP_TIMEOUT, HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, \
+    HTTP_MAX_WORKERS, HTTP_INDEX_MAX_WORKERS, HTTP_PIPELINE_QUEUE_SIZE, HTTP_CHUNK_SIZE, EDGAR_IDENTITY
 
 # Setup logger
 logger = logging.getLogger(__name__)
@@ -49,63 +62,298 @@ logger.addHandler(console)
 edgar.set_identity(EDGAR_IDENTITY)
 
 
-def get_buffer(remote_path: str, base_path: str = HTTP_SEC_HOST):
+class _TokenBucket:
     """
-    Retrieve a remote path to memory.
+    Thread-safe token bucket used to pace requests to SEC. Each process has its own bucket, so
+    the module limiter is sized to a share of HTTP_RATE_LIMIT; see HTTP_RATE_PROCESSES.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.timestamp = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Take a token, sleeping only as long as needed for one to become available.
+        :return:
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.timestamp) * self.rate)
+            self.timestamp = now
+
+            # Reserve the token now so concurrent callers queue up behind us
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+
+
+# Shared session so repeated requests to SEC reuse pooled keep-alive connections
+_SESSION = requests.Session()
+_SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS,
+                                                         pool_maxsize=HTTP_POOL_MAXSIZE,
+                                                         max_retries=0))
+_SESSION.headers.update({"User-Agent": EDGAR_IDENTITY, "Accept-Encoding": "gzip, deflate"})
+# SEC's limit applies across every process crawling from this host, so split it between them
+_LIMITER = _TokenBucket(rate=HTTP_RATE_LIMIT / HTTP_RATE_PROCESSES,
+                        capacity=max(1, HTTP_RATE_BURST // HTTP_RATE_PROCESSES))
+
+# SEC/S3 error pages that may be served with a 200 status, mapped to the error raised for each
+_RATE_LIMIT = b"SEC.gov | Request Rate Threshold Exceeded"
+_NOT_FOUND = b"SEC.gov | File Not Found Error Alert (404)"
+_ACCESS_DENIED = b"<Error><Code>AccessDenied</Code><Message>Access Denied</Message><RequestId>"
+_ERROR_PAGE_MESSAGES = {_RATE_LIMIT: "Exceeded SEC request rate threshold; invalid data retrieved",
+                        _NOT_FOUND: "HTTP 404 for requested path",
+                        _ACCESS_DENIED: "Access denied accessing path"}
+_ERROR_PAGE_RE = re.compile(b"|".join(re.escape(sentinel) for sentinel in _ERROR_PAGE_MESSAGES))
+
+# First year with EDGAR full-index data
+EDGAR_MIN_YEAR = 1994
+
+# Error pages are small, so larger 200 responses are never scanned for sentinels
+_ERROR_PAGE_MAX_SIZE = 65536
+
+# Pipeline stages blocked on a full queue wake this often to check whether the consumer has stopped
+PIPELINE_POLL_INTERVAL = 0.5
+
+
+def _session_get(remote_uri: str, stream: bool = False, headers: dict = None):
+    """
+    Issue a rate-limited GET on the shared session.
+    :param remote_uri: full URI to retrieve
+    :param stream: defer reading the body until iterated
+    :param headers: additional request headers
+    :return: requests response
+    """
+    _LIMITER.acquire()
+    return _SESSION.get(remote_uri, timeout=HTTP_TIMEOUT, stream=stream, headers=headers)
+
+
+def _get_html(remote_uri: str):
+    """
+    Retrieve a page and parse its raw bytes to an HTML tree once, decoding with the charset the
+    server declared, if any, instead of having libxml2 detect it.
+    :param remote_uri: full URI to retrieve
+    :return: lxml HTML element
+    """
+    response = _session_get(remote_uri)
+    parser = None
+    if "charset=" in response.headers.get("Content-Type", "").lower():
+        parser = lxml.html.HTMLParser(encoding=response.encoding)
+    return lxml.html.fromstring(response.content, parser=parser)
+
+
+def get_buffer(remote_path: str, base_path: str = HTTP_SEC_HOST, with_sha1: bool = False, use_cache: bool = False):
+    """
+    Retrieve a remote path to memory; responses are transferred compressed and
+    file_buffer holds the decoded content.
     :param remote_path: remote path on EDGAR to retrieve
     :param base_path: base path to prepend if not default EDGAR path
-    :return: file_buffer, last_modified_date
+    :param with_sha1: also return the sha1 digest of file_buffer, hashed while streaming
+    :param use_cache: revalidate against HttpCache and store the response there; meant for small, frequently
+    polled pages such as directory listings
+    :return: file_buffer, last_modified_date[, file_sha1]
     """
     # Log entrance
-    logger.info("Retrieving remote path {0} to memory".format(remote_path))
+    logger.info("Retrieving remote path %s to memory", remote_path)
 
-    # Build URL
-    remote_uri = urllib.parse.urljoin(base_path, remote_path.lstrip("/"))
+    # Build URL; plain concatenation unless remote_path is already absolute
+    if "://" in remote_path:
+        remote_uri = urllib.parse.urljoin(base_path, remote_path)
+    else:
+        remote_uri = base_path.rstrip("/") + "/" + remote_path.lstrip("/")
 
     # Try to retrieve the file
     complete = False
     failures = 0
     file_buffer = None
+    file_sha1 = None
     last_modified_date = None
+    status_code = None
+
+    # Send validators for a previously cached response so unchanged pages come back as a bodiless 304
+    cache_entry = None
+    cache_headers = None
+    if use_cache:
+        # Local import; only cached requests need the Django app registry, so index listings can run in
+        # spawned worker processes without it
+        from openedgar.models import HttpCache
+        cache_entry = HttpCache.objects.filter(url=remote_uri).first()
+        if cache_entry is not None and cache_entry.content is not None:
+            cache_headers = {}
+            if cache_entry.etag:
+                cache_headers["If-None-Match"] = cache_entry.etag
+            if cache_entry.last_modified:
+                cache_headers["If-Modified-Since"] = cache_entry.last_modified
 
     while not complete:
         try:
-            with requests.Session() as s:
-                r = s.get(remote_uri)
+            with _session_get(remote_uri, stream=True, headers=cache_headers) as r:
+                if r.status_code == 304 and cache_headers:
+                    logger.info("Remote path %s not modified; using cached copy", remote_path)
+                    file_buffer = bytes(cache_entry.content)
+                    file_sha1 = bytes(cache_entry.sha1)
+                    last_modified_date = dateutil.parser.parse(cache_entry.last_modified).date() \
+                        if cache_entry.last_modified else None
+                    return (file_buffer, last_modified_date, file_sha1) if with_sha1 else \
+                        (file_buffer, last_modified_date)
+
                 if 'Last-Modified' in r.headers:
                     try:
                         last_modified_date = dateutil.parser.parse(r.headers['Last-Modified']).date()
                     except Exception as e:  # pylint: disable=broad-except
-                        logger.error("Unable to update last modified date for {0}: {1}".format(remote_path, e))
-
-                file_buffer = r.content
+                        logger.error("Unable to update last modified date for %s: %s", remote_path, e)
+
+                # Hash chunks as they arrive rather than in a second pass over the buffer
+                file_hash = hashlib.sha1(usedforsecurity=False)
+                chunk_buffer = bytearray()
+                for chunk in r.iter_content(chunk_size=HTTP_CHUNK_SIZE):
+                    file_hash.update(chunk)
+                    chunk_buffer += chunk
+
+                file_buffer = bytes(chunk_buffer)
+                file_sha1 = file_hash.digest()
+                status_code = r.status_code
                 complete = True
-
-                # Sleep if set gt0
-                if HTTP_SLEEP_DEFAULT > 0:
-                    time.sleep(HTTP_SLEEP_DEFAULT)
         except Exception as e:  # pylint: disable=broad-except
             # Handle and sleep
             if failures < len(HTTP_FAIL_SLEEP):
-                logger.warning("File {0}, failure {1}: {2}".format(remote_path, failures, e))
-                time.sleep(HTTP_FAIL_SLEEP[failures])
+                logger.warning("File %s, failure %s: %s", remote_path, failures, e)
+                # Jitter so concurrent workers that fail together do not retry together
+                time.sleep(HTTP_FAIL_SLEEP[failures] * (0.5 + random.random()))
                 failures += 1
             else:
-                logger.error("File {0}, failure {1}: {2}".format(remote_path, failures, e))
-                return file_buffer, last_modified_date
+                logger.error("File %s, failure %s: %s", remote_path, failures, e)
+                return (file_buffer, last_modified_date, file_sha1) if with_sha1 else (file_buffer, last_modified_date)
 
-    if b"SEC.gov | Request Rate Threshold Exceeded" in file_buffer:
-        raise RuntimeError("Exceeded SEC request rate threshold; invalid data retrieved")
-    elif b"SEC.gov | File Not Found Error Alert (404)" in file_buffer:
+    if status_code == 404:
         raise RuntimeError("HTTP 404 for requested path")
-    elif b"<Error><Code>AccessDenied</Code><Message>Access Denied</Message><RequestId>" in file_buffer:
-        raise RuntimeError("Access denied accessing path")
+
+    # Check for error pages in a single pass
+    if status_code != 200 or len(file_buffer) < _ERROR_PAGE_MAX_SIZE:
+        error_match = _ERROR_PAGE_RE.search(file_buffer)
+        if error_match is not None:
+            raise RuntimeError(_ERROR_PAGE_MESSAGES[error_match.group(0)])
+
+    # Store validators and content for the next revalidation in a single upsert
+    if use_cache and status_code == 200 and ("ETag" in r.headers or "Last-Modified" in r.headers):
+        HttpCache.objects.bulk_create([HttpCache(url=remote_uri, etag=r.headers.get("ETag"),
+                                                 last_modified=r.headers.get("Last-Modified"),
+                                                 sha1=file_sha1, content=file_buffer)],
+                                      update_conflicts=True, unique_fields=["url"],
+                                      update_fields=["etag", "last_modified", "sha1", "content", "date_updated"])
 
     # Log successful exit
     if complete:
-        logger.info("Successfully retrieved file {0}; {1} bytes".format(remote_path, len(file_buffer)))
+        logger.info("Successfully retrieved file %s; %s bytes", remote_path, len(file_buffer))
+
+    return (file_buffer, last_modified_date, file_sha1) if with_sha1 else (file_buffer, last_modified_date)
+
+
+def put_unless_stopped(item_queue: queue.Queue, item, stop_event: threading.Event):
+    """
+    Put an item on a bounded pipeline queue, giving up once the consumer has stopped.
+    :param item_queue: queue to put the item on
+    :param item: item to put
+    :param stop_event: set by the consumer when it stops reading
+    :return: whether the item was queued
+    """
+    while not stop_event.is_set():
+        try:
+            item_queue.put(item, timeout=PIPELINE_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            continue
+    return False
 
-    return file_buffer, last_modified_date
+
+def stop_pipeline(stop_event: threading.Event, *item_queues: queue.Queue):
+    """
+    Stop a pipeline's producer threads and release the buffers they have queued; see put_unless_stopped.
+    :param stop_event: event checked by the producers
+    :param item_queues: queues to drain
+    :return:
+    """
+    stop_event.set()
+    for item_queue in item_queues:
+        while True:
+            try:
+                item_queue.get_nowait()
+            except queue.Empty:
+                break
+
+
+def store_buffers(path_pair_list: Iterable[Tuple[str, str]], client, queue_size: int = HTTP_PIPELINE_QUEUE_SIZE,
+                  max_workers: int = HTTP_MAX_WORKERS):
+    """
+    Retrieve remote paths and store them with a storage client, storing each buffer
+    while the next ones are retrieved.
+    :param path_pair_list: iterable of (remote_path, local_path) pairs
+    :param client: storage client providing put_buffer, e.g., S3Client or LocalClient
+    :param queue_size: maximum number of retrieved buffers waiting to be stored
+    :param max_workers: number of concurrent downloads; the shared rate limiter still paces requests to SEC
+    :return: generator of (remote_path, local_path, success), in completion order
+    """
+    # Bounded queue caps memory at queue_size buffers and applies backpressure to the downloaders
+    buffer_queue = queue.Queue(maxsize=queue_size)
+    stop_event = threading.Event()
+    download_errors = []
+    path_pair_iter = iter(path_pair_list)
+    path_pair_lock = threading.Lock()
+
+    def download():
+        try:
+            while not stop_event.is_set():
+                with path_pair_lock:
+                    path_pair = next(path_pair_iter, None)
+                if path_pair is None:
+                    break
+
+                remote_path, local_path = path_pair
+                try:
+                    buffer, _ = get_buffer(remote_path)
+                except RuntimeError as e:
+                    logger.error("Unable to access resource %s from EDGAR: %s", remote_path, e)
+                    buffer = None
+                put_unless_stopped(buffer_queue, (remote_path, local_path, buffer), stop_event)
+        except Exception as e:  # pylint: disable=broad-except
+            download_errors.append(e)
+        finally:
+            put_unless_stopped(buffer_queue, None, stop_event)
+
+    downloaders = [threading.Thread(target=download, daemon=True) for _ in range(max_workers)]
+    for downloader in downloaders:
+        downloader.start()
+
+    # Store buffers as they arrive, until every downloader has finished; if the caller stops early or storing
+    # fails, release the downloaders rather than leaving them blocked on a full queue
+    try:
+        active_downloaders = len(downloaders)
+        while active_downloaders > 0:
+            item = buffer_queue.get()
+            if item is None:
+                active_downloaders -= 1
+                continue
+
+            remote_path, local_path, buffer = item
+            if buffer is None:
+                yield remote_path, local_path, False
+            else:
+                client.put_buffer(local_path, buffer)
+                yield remote_path, local_path, True
+    finally:
+        stop_pipeline(stop_event, buffer_queue)
+
+    # Surface any unexpected downloader failure
+    for downloader in downloaders:
+        downloader.join()
+    if len(download_errors) > 0:
+        raise download_errors[0]
 
 
 def list_path(remote_path: str):
@@ -115,78 +363,116 @@ def list_path(remote_path: str):
     :return:
     """
     # Log entrance
-    logger.info("Retrieving directory listing from {0}".format(remote_path))
-    remote_buffer, _ = get_buffer(remote_path)
+    logger.info("Retrieving directory listing from %s", remote_path)
+    remote_buffer, _ = get_buffer(remote_path, use_cache=True)
 
     # Parse the index listing
     if remote_buffer is None:
-        logger.warning("list_path for {0} was passed None buffer".format(remote_path))
+        logger.warning("list_path for %s was passed None buffer", remote_path)
         return []
 
-    # Parse buffer to HTML
-    html_doc = lxml.html.fromstring(remote_buffer)
-
-    try:
-        # Find links in directory listing
-        link_list = html_doc.get_element_by_id("main-content").xpath(".//a")
-        good_link_list = [l for l in link_list if "Parent Directory" not in
-                          lxml.html.tostring(l, method="text", encoding="utf-8").decode("utf-8")]
-        good_url_list = []
-
-        # Populate new URL list
-        for l in good_link_list:
-            # Get raw HREF
-            href = l.attrib["href"]
-            if href.startswith("/"):
-                good_url_list.append(href)
-            else:
-                good_url_list.append("/".join(s for s in [remote_path, href.lstrip("/")]))
-    except KeyError as e:
-        logger.error("Unable to find main-content tag in {0}; {1}".format(remote_path, e))
+    # Select link targets inside the main-content element in one XPath query, skipping parent links
+    document = lxml.html.fromstring(remote_buffer)
+    main_content = document.xpath('//*[@id="main-content"]')
+    if not main_content:
+        logger.error("Unable to find main-content tag in %s", remote_path)
         return None
 
+    base_path = remote_path.rstrip("/")
+    good_url_list = [href if href[0] == "/" else f"{base_path}/{href}"
+                     for href in main_content[0].xpath('.//a[not(contains(., "Parent Directory"))]/@href')
+                     if href]
+
     # Log
-    logger.info("Successfully retrieved {0} links from {1}".format(len(good_url_list), remote_path))
+    logger.info("Successfully retrieved %s links from %s", len(good_url_list), remote_path)
     return good_url_list
 
 
-def list_index_by_year(year: int):
+def list_index_by_year(year: int, as_pandas: bool = True):
     """
     Get list of index files for a given year.
     :param year: filing year to retrieve
+    :param as_pandas: return a pandas DataFrame; otherwise return the underlying pyarrow Table
     :return:
     """
     # Log entrance
-    logger.info("Locating form index list for {0}".format(year))
+    logger.info("Locating form index list for %s", year)
+
+    # edgartools fetches each quarterly index itself, outside _SESSION, so take a limiter token per quarter first
+    today = datetime.date.today()
+    for _ in range(4 if year < today.year else (today.month - 1) // 3 + 1):
+        _LIMITER.acquire()
+
+    # Form index table
+    filings = edgar.get_filings(year)
+    if filings is None:
+        form_index = pandas.DataFrame() if as_pandas else pyarrow.table({})
+    elif as_pandas:
+        form_index = filings.to_pandas()
+    else:
+        form_index = filings.data
 
-    # Form index dataframe
-    form_index_df = edgar.get_filings(year).to_pandas()
-    
     # Log exit
-    logger.info("Successfully located {0} form index files for {1}".format(form_index_df.shape[0], year))
+    logger.info("Successfully located %s form index files for %s", form_index.shape[0], year)
 
     # Return
-    return form_index_df
+    return form_index
 
 
-def list_index(min_year: int = 1950, max_year: int = 2050):
+def list_index(min_year: int = 1950, max_year: int = 2050, max_workers: int = HTTP_INDEX_MAX_WORKERS,
+               as_pandas: bool = True):
     """
     Get the list of form index files on SEC HTTP.
     :param min_year: min filing year to begin listing
     :param max_year: max filing year to list
+    :param max_workers: number of years to retrieve in parallel; the shared rate limiter still paces requests to SEC
+    :param as_pandas: return a pandas DataFrame; otherwise return a pyarrow Table
     :return:
     """
     # Log entrance
     logger.info("Retrieving form index list")
 
-    # Retrieve dataframe
-    form_index_df = edgar.get_filings(range(min_year, max_year + 1)).to_pandas()
+    # Only request years that EDGAR can have indexed
+    year_list = range(max(min_year, EDGAR_MIN_YEAR), min(max_year, datetime.date.today().year) + 1)
+
+    # Retrieve years as Arrow on threads, so every fetch draws on this process's limiter, then concatenate
+    # without copying
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        form_index_table_list = [table for table in
+                                 executor.map(functools.partial(list_index_by_year, as_pandas=False), year_list)
+                                 if table.num_columns > 0]
+    if len(form_index_table_list) > 0:
+        form_index = pyarrow.concat_tables(form_index_table_list)
+    else:
+        form_index = pyarrow.table({})
+
+    # Convert once at the boundary, releasing Arrow buffers as columns are converted
+    if as_pandas:
+        form_index = form_index.to_pandas(split_blocks=True, self_destruct=True)
 
     # Log exit
-    logger.info("Successfully located {0} form index files from {1} to {2}".format(form_index_df.shape[0], min_year, max_year))
+    logger.info("Successfully located %s form index files from %s to %s", form_index.shape[0], min_year, max_year)
 
     # Return
-    return form_index_df
+    return form_index
+
+
+def get_index_paths(min_year: int = EDGAR_MIN_YEAR, max_year: int = None):
+    """
+    Get the quarterly form index paths on EDGAR, from min_year through the current quarter.
+    :param min_year: first filing year
+    :param max_year: last filing year; defaults to the current year
+    :return: sorted list of paths, e.g., /Archives/edgar/full-index/1994/QTR3/form.gz
+    """
+    # Every quarter has an index, so build the paths rather than listing filings to find them
+    today = datetime.date.today()
+    current_quarter = (today.year, (today.month - 1) // 3 + 1)
+    if max_year is None:
+        max_year = today.year
+
+    return ["{0}{1}/QTR{2}/form.gz".format(HTTP_SEC_FULL_INDEX_PATH, year, quarter)
+            for year in range(max(min_year, EDGAR_MIN_YEAR), min(max_year, today.year) + 1)
+            for quarter in range(1, 5) if (year, quarter) <= current_quarter]
 
 
 def get_company(cik: Union[int, str]):
@@ -197,16 +483,13 @@ def get_company(cik: Union[int, str]):
     """
 
     # Log entrance
-    logger.info("Retrieving company info for CIK={0}".format(cik))
+    logger.info("Retrieving company info for CIK=%s", cik)
 
     # Setup company URL
     company_url = "https://www.sec.gov/cgi-bin/browse-edgar?action=getcompany&CIK={0}".format(cik)
 
-    # Retrieve buffer
-    remote_buffer = requests.get(company_url).content
-
-    # Parse buffer to HTML
-    html_doc = lxml.html.fromstring(remote_buffer)
+    # Retrieve buffer and parse to HTML
+    html_doc = _get_html(company_url)
     content_div = html_doc.get_element_by_id("contentDiv")
     company_info_div = list(content_div)[1]
 
@@ -214,48 +497,46 @@ def get_company(cik: Union[int, str]):
     company_data = {}
 
     try:
-        raw_address = lxml.html.tostring(list(company_info_div)[0], method="text",
-                                         encoding="utf-8").decode("utf-8")
+        raw_address = list(company_info_div)[0].text_content()
         mailing_address = " ".join(raw_address.splitlines()[1:]).strip()
         company_data["mailing_address"] = mailing_address
     except Exception as e:  # pylint: disable=broad-except
-        logger.warning("Unable to parse mailing_address: {0}".format(e))
+        logger.warning("Unable to parse mailing_address: %s", e)
         company_data["mailing_address"] = None
 
     try:
-        raw_address = lxml.html.tostring(list(company_info_div)[1], method="text",
-                                         encoding="utf-8").decode("utf-8")
+        raw_address = list(company_info_div)[1].text_content()
         business_address = " ".join(raw_address.splitlines()[1:]).strip()
         company_data["business_address"] = business_address
     except Exception as e:  # pylint: disable=broad-except
-        logger.warning("Unable to parse business_address: {0}".format(e))
+        logger.warning("Unable to parse business_address: %s", e)
         company_data["business_address"] = None
 
     try:
         company_data["name"] = list(list(company_info_div)[2])[0].text.strip()
     except Exception as e:  # pylint: disable=broad-except
-        logger.warning("Unable to parse name: {0}".format(e))
+        logger.warning("Unable to parse name: %s", e)
         company_data["name"] = None
 
     try:
         ident_info_p = list(list(company_info_div)[2])[1]
         company_data["sic"] = list(ident_info_p)[1].text
     except Exception as e:  # pylint: disable=broad-except
-        logger.warning("Unable to parse SIC: {0}".format(e))
+        logger.warning("Unable to parse SIC: %s", e)
         company_data["sic"] = None
 
     try:
         ident_info_p = list(list(company_info_div)[2])[1]
         company_data["state_location"] = list(ident_info_p)[3].text
     except Exception as e:  # pylint: disable=broad-except
-        logger.warning("Unable to parse SIC: {0}".format(e))
+        logger.warning("Unable to parse SIC: %s", e)
         company_data["state_location"] = None
 
     try:
         ident_info_p = list(list(company_info_div)[2])[1]
         company_data["state_incorporation"] = list(ident_info_p)[4].text
     except Exception as e:  # pylint: disable=broad-except
-        logger.warning("Unable to parse SIC: {0}".format(e))
+        logger.warning("Unable to parse SIC: %s", e)
         company_data["state_incorporation"] = None
 
     return company_data
@@ -270,12 +551,10 @@ def get_cfia_index():
     logger.info("Retrieving CFIA 2006 index values")
 
     # Retrieve page and parse to HTML
-    remote_buffer = requests.get("https://www.sec.gov/divisions/corpfin/organization/cfia.shtml").content
-    html_doc = lxml.html.fromstring(remote_buffer)
+    html_doc = _get_html("https://www.sec.gov/divisions/corpfin/organization/cfia.shtml")
 
-    # Get index values
-    index_values = [a.attrib['href'].split('-').pop()[:-4] for a in html_doc.findall(".//a") if
-                    a.attrib['href'].startswith('cfia-')]
+    # Get index values in one XPath query, skipping anchors without links
+    index_values = [href.split('-').pop()[:-4] for href in html_doc.xpath('//a[starts-with(@href, "cfia-")]/@href')]
     return index_values
 
 
@@ -287,12 +566,11 @@ def get_cfia_table(index: str):
     """
 
     # Log entrance
-    logger.info("Retrieving CFIA 2006 CIK/SIC values for index={0}".format(index))
+    logger.info("Retrieving CFIA 2006 CIK/SIC values for index=%s", index)
 
     # Get remote buffer and parse to HTML
     cfia_url = "https://www.sec.gov/divisions/corpfin/organization/cfia-{0}.htm".format(index)
-    remote_buffer = requests.get(cfia_url).content
-    html_doc = lxml.html.fromstring(remote_buffer)
+    html_doc = _get_html(cfia_url)
 
     # Parse table into list of tuples
     table_element = html_doc.get_element_by_id("cos")
@@ -23,10 +23,15 @@ SOFTWARE.
 """
 
 # Libraries
+import functools
+import io
 import logging
+import tempfile
+import threading
 
 # Packages
 import boto3
+import boto3.s3.transfer
 import botocore.exceptions
 
 # Project
@@ -34,7 +39,8 @@ import zlib
 
 from typing import Union
 
-from config.settings.base import S3_ACCESS_KEY, S3_BUCKET, S3_COMPRESSION_LEVEL, S3_SECRET_KEY
+from config.settings.base import S3_ACCESS_KEY, S3_BUCKET, S3_CHUNK_SIZE, S3_COMPRESSION_LEVEL, S3_SECRET_KEY, \
+    S3_MULTIPART_THRESHOLD, S3_MULTIPART_CHUNKSIZE, S3_TRANSFER_CONCURRENCY
 
 # Setup logger
 logger = logging.getLogger(__name__)
@@ -45,10 +51,32 @@ formatter = logging.Formatter('%(name)-12s: %(levelname)-8s %(message)s')
 console.setFormatter(formatter)
 logger.addHandler(console)
 
+# Multipart settings for uploads over S3_MULTIPART_THRESHOLD
+TRANSFER_CONFIG = boto3.s3.transfer.TransferConfig(multipart_threshold=S3_MULTIPART_THRESHOLD,
+                                                   multipart_chunksize=S3_MULTIPART_CHUNKSIZE,
+                                                   max_concurrency=S3_TRANSFER_CONCURRENCY, use_threads=True)
+
+
+def deflate_buffer(buffer: bytes, level: int = S3_COMPRESSION_LEVEL):
+    """
+    zlib-compress a buffer, sizing the compression window and hash table to the buffer so
+    small documents don't pay for allocating and clearing full-size zlib state on every call.
+    The output is a standard zlib stream readable with zlib.decompress.
+    :param buffer: buffer to compress
+    :param level: zlib compression level
+    :return:
+    """
+    # A window at least as large as the buffer finds every match the full 32 KiB window would
+    wbits = min(zlib.MAX_WBITS, max(9, len(buffer).bit_length()))
+    compressor = zlib.compressobj(level, zlib.DEFLATED, wbits, max(1, min(zlib.DEF_MEM_LEVEL, wbits - 7)))
+    return compressor.compress(buffer) + compressor.flush()
+
 
 class S3Client:
 
     def __init__(self):
+        self.client = None
+        self.client_lock = threading.Lock()
         logger.info("Initialized S3 client")
 
     def get_resource(self):
@@ -62,12 +90,14 @@ class S3Client:
 
     def get_client(self):
         """
-        Get S3 client.
+        Get S3 client, created once and shared; boto3 clients are thread-safe once created.
         :return: returns boto3 S3 client object
         """
-        # Create S3 client
-        client = boto3.client('s3', aws_access_key_id=S3_ACCESS_KEY, aws_secret_access_key=S3_SECRET_KEY)
-        return client
+        # Create S3 client on first use
+        with self.client_lock:
+            if self.client is None:
+                self.client = boto3.client('s3', aws_access_key_id=S3_ACCESS_KEY, aws_secret_access_key=S3_SECRET_KEY)
+        return self.client
 
     def get_bucket(self):
         """
@@ -97,7 +127,7 @@ class S3Client:
             if e.response['Error']['Code'] == "404":
                 return False
             else:
-                logger.error("Unable to check if path {0} exists: {1}".format(path, e))
+                logger.error("Unable to check if path %s exists: %s", path, e)
 
     def delete_path(self, path: str, client=None):
         """
@@ -117,7 +147,7 @@ class S3Client:
             if e.response['Error']['Code'] == "404":
                 return False
             else:
-                logger.error("Unable to delete path {0}: {1}".format(path, e))
+                logger.error("Unable to delete path %s: %s", path, e)
 
     def list_path(self, path: str, client=None):
         """
@@ -193,6 +223,44 @@ class S3Client:
         else:
             return buffer
 
+    def get_buffer_if_exists(self, remote_path: str, client=None, deflate: bool = True):
+        """
+        Get a file from S3 given a path and optional client, in place of a path_exists check followed by get_buffer.
+        :param remote_path: S3 path under bucket
+        :param client: optional client to re-use
+        :param deflate: whether to automatically zlib deflate contents
+        :return: buffer bytes/str, or None if no object exists at the path
+        """
+        try:
+            return self.get_buffer(remote_path, client=client, deflate=deflate)
+        except botocore.exceptions.ClientError as e:
+            if e.response['Error']['Code'] in ("NoSuchKey", "404"):
+                return None
+            raise
+
+    def download_to_fileobj(self, remote_path: str, fileobj, client=None, deflate: bool = True):
+        """
+        Stream a file from S3 into a writable binary file object without holding it in memory.
+        :param remote_path: S3 path under bucket
+        :param fileobj: file object to write to
+        :param client: optional client to re-use
+        :param deflate: whether to automatically zlib deflate contents
+        :return:
+        """
+        # Get client
+        if client is None:
+            client = self.get_client()
+
+        # Get object
+        s3_object = client.get_object(Bucket=S3_BUCKET, Key=remote_path)
+
+        # Copy body in bounded chunks, deflating as we go if requested
+        decompressor = zlib.decompressobj() if deflate else None
+        for chunk in s3_object["Body"].iter_chunks(S3_CHUNK_SIZE):
+            fileobj.write(decompressor.decompress(chunk) if decompressor else chunk)
+        if decompressor:
+            fileobj.write(decompressor.flush())
+
     def get_file(self, remote_path: str, local_path: str, client=None, deflate: bool = True):
         """
         Save a local file from S3 given a path and optional client.
@@ -202,9 +270,9 @@ class S3Client:
         :param deflate: whether to automatically zlib deflate contents
         :return:
         """
-        # Open and write buffer
+        # Open and stream into file
         with open(local_path, "wb") as out_file:
-            out_file.write(self.get_buffer(remote_path, client, deflate))
+            self.download_to_fileobj(remote_path, out_file, client, deflate)
 
     def get_buffer_segment(self, remote_path: str, start_pos: int, end_pos: int, client=None, deflate: bool = True):
         """
@@ -242,20 +310,40 @@ class S3Client:
             raise TypeError("buffer must be bytes or str")
 
         if deflate:
-            upload_buffer = zlib.compress(upload_buffer, S3_COMPRESSION_LEVEL)
+            upload_buffer = deflate_buffer(upload_buffer)
+
+        # Upload large buffers as concurrent multipart chunks, small ones in a single request
+        if len(upload_buffer) > S3_MULTIPART_THRESHOLD:
+            client.upload_fileobj(io.BytesIO(upload_buffer), S3_BUCKET, remote_path, Config=TRANSFER_CONFIG)
+            return True
 
-        # Upload
         response = client.put_object(Bucket=S3_BUCKET, Key=remote_path, Body=upload_buffer)
         return True if response["ResponseMetadata"]["HTTPStatusCode"] == 200 else False
 
     def put_file(self, remote_path: str, local_path: str, client=None, deflate: bool = True):
         """
-        Save a local file from S3 given a path and optional client.
+        Upload a local file to S3 given a path and optional client, streaming rather than reading it into memory.
         :param remote_path: S3 path under bucket
-        :param local_path: local path to save to
+        :param local_path: local path to upload
         :param client: optional client to re-use
         :param deflate: whether to automatically zlib deflate contents
         :return:
         """
+        # Get client
+        if client is None:
+            client = self.get_client()
+
         with open(local_path, "rb") as in_file:
-            self.put_buffer(remote_path, in_file.read(), client, deflate)
+            if not deflate:
+                client.upload_fileobj(in_file, S3_BUCKET, remote_path, Config=TRANSFER_CONFIG)
+                return True
+
+            # Compress in bounded chunks, spilling to disk past the multipart threshold
+            compressor = zlib.compressobj(S3_COMPRESSION_LEVEL)
+            with tempfile.SpooledTemporaryFile(max_size=S3_MULTIPART_THRESHOLD) as upload_file:
+                for chunk in iter(functools.partial(in_file.read, S3_CHUNK_SIZE), b""):
+                    upload_file.write(compressor.compress(chunk))
+                upload_file.write(compressor.flush())
+                upload_file.seek(0)
+                client.upload_fileobj(upload_file, S3_BUCKET, remote_path, Config=TRANSFER_CONFIG)
+        return True
@@ -0,0 +1,46 @@
+# Generated by Django 5.0.2 on 2026-10-15 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('openedgar', '0007_remove_companyinfo_id_alter_companyinfo_cik'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='filing',
+            name='company',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='openedgar.company'),
+        ),
+        migrations.AlterField(
+            model_name='filing',
+            name='form_type',
+            field=models.CharField(max_length=64, null=True),
+        ),
+        migrations.AlterField(
+            model_name='filing',
+            name='is_error',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name='filing',
+            name='is_processed',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='filing',
+            index=models.Index(fields=['form_type', 'date_filed'], name='filing_form_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='filing',
+            index=models.Index(fields=['company', 'form_type'], name='filing_company_form_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='filing',
+            index=models.Index(condition=models.Q(('is_processed', False)), fields=['is_processed', 'is_error'], name='filing_work_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.0.2 on 2026-10-15 09:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('openedgar', '0008_filing_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='filing',
+            name='accession_number',
+            field=models.CharField(max_length=20, null=True),
+        ),
+        migrations.AlterField(
+            model_name='filing',
+            name='sha1',
+            field=models.CharField(db_index=True, max_length=40, null=True),
+        ),
+        migrations.AlterField(
+            model_name='filingdocument',
+            name='content_type',
+            field=models.CharField(max_length=128, null=True),
+        ),
+        migrations.AlterField(
+            model_name='filingdocument',
+            name='sha1',
+            field=models.CharField(db_index=True, max_length=40),
+        ),
+        migrations.AlterField(
+            model_name='filingdocument',
+            name='type',
+            field=models.CharField(db_index=True, max_length=64, null=True),
+        ),
+    ]
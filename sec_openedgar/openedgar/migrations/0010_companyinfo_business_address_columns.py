@@ -0,0 +1,50 @@
+# Generated by Django 5.0.2 on 2026-10-15 10:02
+
+from django.db import migrations, models
+
+
+def populate_business_address_columns(apps, schema_editor):
+    """
+    Copy city, state and zip out of the business_address JSON into their own columns.
+    """
+    CompanyInfo = apps.get_model('openedgar', 'CompanyInfo')
+    batch = []
+    for company_info in CompanyInfo.objects.filter(business_address__isnull=False).iterator(chunk_size=2000):
+        address = company_info.business_address
+        if not isinstance(address, dict):
+            continue
+        company_info.business_city = address.get('city')
+        company_info.business_state = address.get('state_or_country')
+        company_info.business_zip = address.get('zipcode')
+        batch.append(company_info)
+        if len(batch) >= 1000:
+            CompanyInfo.objects.bulk_update(batch, ['business_city', 'business_state', 'business_zip'])
+            batch = []
+    if batch:
+        CompanyInfo.objects.bulk_update(batch, ['business_city', 'business_state', 'business_zip'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('openedgar', '0009_alter_filing_widths'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='companyinfo',
+            name='business_city',
+            field=models.CharField(max_length=1024, null=True),
+        ),
+        migrations.AddField(
+            model_name='companyinfo',
+            name='business_state',
+            field=models.CharField(db_index=True, max_length=2, null=True),
+        ),
+        migrations.AddField(
+            model_name='companyinfo',
+            name='business_zip',
+            field=models.CharField(max_length=16, null=True),
+        ),
+        migrations.RunPython(populate_business_address_columns, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.2 on 2026-10-15 10:24
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('openedgar', '0010_companyinfo_business_address_columns'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='filing',
+            name='date_filed',
+            field=models.DateField(null=True),
+        ),
+        migrations.AddIndex(
+            model_name='filing',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['date_filed'], name='filing_date_filed_brin', pages_per_range=32),
+        ),
+    ]
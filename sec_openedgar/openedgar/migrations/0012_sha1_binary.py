@@ -0,0 +1,63 @@
+# Generated by Django 5.0.2 on 2026-10-15 10:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('openedgar', '0011_filing_date_filed_brin'),
+    ]
+
+    operations = [
+        # Stage raw digests alongside the hex columns
+        migrations.AddField(
+            model_name='filing',
+            name='sha1_digest',
+            field=models.BinaryField(max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='filingdocument',
+            name='sha1_digest',
+            field=models.BinaryField(max_length=20, null=True),
+        ),
+        migrations.RunSQL(
+            sql=[
+                "UPDATE openedgar_filing SET sha1_digest = decode(sha1, 'hex') WHERE sha1 IS NOT NULL",
+                "UPDATE openedgar_filingdocument SET sha1_digest = decode(sha1, 'hex')",
+            ],
+            reverse_sql=[
+                "UPDATE openedgar_filing SET sha1 = encode(sha1_digest, 'hex') WHERE sha1_digest IS NOT NULL",
+                "UPDATE openedgar_filingdocument SET sha1 = encode(sha1_digest, 'hex')",
+            ],
+        ),
+        # Swap the digest columns in for the hex columns
+        migrations.RemoveField(
+            model_name='filing',
+            name='sha1',
+        ),
+        migrations.RemoveField(
+            model_name='filingdocument',
+            name='sha1',
+        ),
+        migrations.RenameField(
+            model_name='filing',
+            old_name='sha1_digest',
+            new_name='sha1',
+        ),
+        migrations.RenameField(
+            model_name='filingdocument',
+            old_name='sha1_digest',
+            new_name='sha1',
+        ),
+        migrations.AlterField(
+            model_name='filing',
+            name='sha1',
+            field=models.BinaryField(db_index=True, max_length=20, null=True),
+        ),
+        migrations.AlterField(
+            model_name='filingdocument',
+            name='sha1',
+            field=models.BinaryField(db_index=True, max_length=20),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.2 on 2026-10-15 11:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('openedgar', '0012_sha1_binary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HttpCache',
+            fields=[
+                ('url', models.CharField(max_length=1024, primary_key=True, serialize=False)),
+                ('etag', models.CharField(max_length=256, null=True)),
+                ('last_modified', models.CharField(max_length=64, null=True)),
+                ('sha1', models.BinaryField(max_length=20, null=True)),
+                ('content', models.BinaryField(null=True)),
+                ('date_updated', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.2 on 2026-10-15 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('openedgar', '0013_httpcache'),
+    ]
+
+    operations = [
+        # Pack NNNNNNNNNN-NN-NNNNNN into its 18 digits in place; malformed values become NULL
+        migrations.RunSQL(
+            sql="""ALTER TABLE openedgar_filing ALTER COLUMN accession_number TYPE bigint
+USING CASE WHEN accession_number ~ '^\\d{10}-?\\d{2}-?\\d{6}$'
+THEN replace(accession_number, '-', '')::bigint END""",
+            reverse_sql="""ALTER TABLE openedgar_filing ALTER COLUMN accession_number TYPE varchar(20)
+USING regexp_replace(lpad(accession_number::text, 18, '0'), '^(.{10})(.{2})(.{6})$', '\\1-\\2-\\3')""",
+            state_operations=[
+                migrations.AlterField(
+                    model_name='filing',
+                    name='accession_number',
+                    field=models.BigIntegerField(null=True),
+                ),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='filing',
+            name='accession_number',
+            field=models.BigIntegerField(db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,100 @@
+# Generated by Django 5.0.2 on 2026-10-15 11:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('openedgar', '0014_filing_accession_number_bigint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FormType',
+            fields=[
+                ('id', models.SmallAutoField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=64, unique=True)),
+            ],
+        ),
+        # Stage lookup references alongside the string columns
+        migrations.AddField(
+            model_name='filing',
+            name='form_type_ref',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT,
+                                    related_name='+', to='openedgar.formtype'),
+        ),
+        migrations.AddField(
+            model_name='filingdocument',
+            name='type_ref',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT,
+                                    related_name='+', to='openedgar.formtype'),
+        ),
+        migrations.RunSQL(
+            sql=[
+                """INSERT INTO openedgar_formtype (name)
+SELECT form_type FROM openedgar_filing WHERE form_type IS NOT NULL
+UNION SELECT type FROM openedgar_filingdocument WHERE type IS NOT NULL""",
+                """UPDATE openedgar_filing f SET form_type_ref_id = ft.id
+FROM openedgar_formtype ft WHERE ft.name = f.form_type""",
+                """UPDATE openedgar_filingdocument fd SET type_ref_id = ft.id
+FROM openedgar_formtype ft WHERE ft.name = fd.type""",
+                # Check the deferred foreign keys now, since tables with pending trigger events cannot be altered
+                "SET CONSTRAINTS ALL IMMEDIATE",
+            ],
+            reverse_sql=[
+                """UPDATE openedgar_filing f SET form_type = ft.name
+FROM openedgar_formtype ft WHERE ft.id = f.form_type_ref_id""",
+                """UPDATE openedgar_filingdocument fd SET type = ft.name
+FROM openedgar_formtype ft WHERE ft.id = fd.type_ref_id""",
+            ],
+        ),
+        # Swap the lookup references in for the string columns
+        migrations.RemoveIndex(
+            model_name='filing',
+            name='filing_form_date_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='filing',
+            name='filing_company_form_idx',
+        ),
+        migrations.RemoveField(
+            model_name='filing',
+            name='form_type',
+        ),
+        migrations.RemoveField(
+            model_name='filingdocument',
+            name='type',
+        ),
+        migrations.RenameField(
+            model_name='filing',
+            old_name='form_type_ref',
+            new_name='form_type',
+        ),
+        migrations.RenameField(
+            model_name='filingdocument',
+            old_name='type_ref',
+            new_name='type',
+        ),
+        migrations.AlterField(
+            model_name='filing',
+            name='form_type',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT,
+                                    to='openedgar.formtype'),
+        ),
+        migrations.AlterField(
+            model_name='filingdocument',
+            name='type',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT,
+                                    to='openedgar.formtype'),
+        ),
+        migrations.AddIndex(
+            model_name='filing',
+            index=models.Index(fields=['form_type', 'date_filed'], name='filing_form_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='filing',
+            index=models.Index(fields=['company', 'form_type'], name='filing_company_form_idx'),
+        ),
+    ]
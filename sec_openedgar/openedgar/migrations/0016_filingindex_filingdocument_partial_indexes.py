@@ -0,0 +1,71 @@
+# Generated by Django 5.0.2 on 2026-10-15 12:05
+
+import django.db.models.deletion
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built concurrently so ingest can keep writing during the migration
+    atomic = False
+
+    dependencies = [
+        ('openedgar', '0015_formtype'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='companyinfo',
+            name='sic_description',
+            field=models.CharField(max_length=1024, null=True),
+        ),
+        migrations.AlterField(
+            model_name='filingindex',
+            name='is_error',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name='filingindex',
+            name='is_processed',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name='filingdocument',
+            name='filing',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='openedgar.filing'),
+        ),
+        migrations.AlterField(
+            model_name='filingdocument',
+            name='sequence',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='filingdocument',
+            name='start_pos',
+            field=models.IntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='filingdocument',
+            name='end_pos',
+            field=models.IntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='filingdocument',
+            name='is_error',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name='filingdocument',
+            name='is_processed',
+            field=models.BooleanField(default=False),
+        ),
+        AddIndexConcurrently(
+            model_name='filingindex',
+            index=models.Index(condition=models.Q(('is_processed', False)), fields=['is_processed', 'is_error'], name='filingindex_work_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='filingdocument',
+            index=models.Index(condition=models.Q(('is_processed', False)), fields=['is_processed', 'is_error'], name='filingdocument_work_idx'),
+        ),
+    ]
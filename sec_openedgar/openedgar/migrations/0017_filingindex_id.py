@@ -0,0 +1,39 @@
+# Generated by Django 5.0.2 on 2026-10-15 12:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('openedgar', '0016_filingindex_filingdocument_partial_indexes'),
+    ]
+
+    operations = [
+        # Move the primary key from the URL to a bigint identity column, keeping the URL unique
+        migrations.RunSQL(
+            sql=[
+                "ALTER TABLE openedgar_filingindex DROP CONSTRAINT openedgar_filingindex_pkey",
+                "ALTER TABLE openedgar_filingindex ADD COLUMN id bigint GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY",
+                "ALTER TABLE openedgar_filingindex ADD CONSTRAINT openedgar_filingindex_edgar_url_key UNIQUE (edgar_url)",
+            ],
+            reverse_sql=[
+                "ALTER TABLE openedgar_filingindex DROP CONSTRAINT openedgar_filingindex_edgar_url_key",
+                "ALTER TABLE openedgar_filingindex DROP COLUMN id",
+                "ALTER TABLE openedgar_filingindex ADD PRIMARY KEY (edgar_url)",
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='filingindex',
+                    name='edgar_url',
+                    field=models.CharField(max_length=1024, unique=True),
+                ),
+                migrations.AddField(
+                    model_name='filingindex',
+                    name='id',
+                    field=models.BigAutoField(primary_key=True, serialize=False),
+                    preserve_default=False,
+                ),
+            ],
+        ),
+    ]
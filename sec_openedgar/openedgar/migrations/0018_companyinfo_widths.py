@@ -0,0 +1,38 @@
+# Generated by Django 5.0.2 on 2026-10-15 12:51
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('openedgar', '0017_filingindex_id'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='companyinfo',
+            name='entity_type',
+            field=models.CharField(max_length=64, null=True),
+        ),
+        migrations.AlterField(
+            model_name='companyinfo',
+            name='ein',
+            field=models.CharField(max_length=16, null=True),
+        ),
+        migrations.AlterField(
+            model_name='companyinfo',
+            name='fiscal_year_end',
+            field=models.CharField(max_length=4, null=True),
+        ),
+        migrations.AlterField(
+            model_name='companyinfo',
+            name='exchanges',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=32), null=True, size=None),
+        ),
+        migrations.AddConstraint(
+            model_name='companyinfo',
+            constraint=models.CheckConstraint(check=models.Q(('fiscal_year_end__regex', '^([0-9]{4})?$')), name='companyinfo_fiscal_year_end_mmdd'),
+        ),
+    ]
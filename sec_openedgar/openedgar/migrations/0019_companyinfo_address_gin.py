@@ -0,0 +1,25 @@
+# Generated by Django 5.0.2 on 2026-10-15 13:04
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('openedgar', '0018_companyinfo_widths'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='companyinfo',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['business_address'], name='ci_biz_addr_gin', opclasses=['jsonb_path_ops']),
+        ),
+        AddIndexConcurrently(
+            model_name='companyinfo',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['mailing_address'], name='ci_mail_addr_gin', opclasses=['jsonb_path_ops']),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.2 on 2026-10-15 13:12
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('openedgar', '0019_companyinfo_address_gin'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='companyinfo',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tickers'], name='ci_tickers_gin'),
+        ),
+        AddIndexConcurrently(
+            model_name='companyinfo',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['exchanges'], name='ci_exch_gin'),
+        ),
+    ]
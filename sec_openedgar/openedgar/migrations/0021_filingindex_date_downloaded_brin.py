@@ -0,0 +1,24 @@
+# Generated by Django 5.0.2 on 2026-10-15 13:40
+
+import django.contrib.postgres.indexes
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('openedgar', '0020_companyinfo_ticker_gin'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='filingindex',
+            name='date_downloaded',
+            field=models.DateField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='filingindex',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['date_downloaded'], name='filingindex_downloaded_brin', pages_per_range=32),
+        ),
+    ]
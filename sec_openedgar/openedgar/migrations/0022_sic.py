@@ -0,0 +1,42 @@
+# Generated by Django 5.0.2 on 2026-10-15 14:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('openedgar', '0021_filingindex_date_downloaded_brin'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SIC',
+            fields=[
+                ('code', models.CharField(max_length=4, primary_key=True, serialize=False)),
+                ('description', models.CharField(max_length=1024, null=True)),
+            ],
+        ),
+        # Move descriptions into the lookup table; the sic column keeps its values and becomes the reference
+        migrations.RunSQL(
+            sql=[
+                "UPDATE openedgar_companyinfo SET sic = NULL WHERE sic = ''",
+                """INSERT INTO openedgar_sic (code, description)
+SELECT sic, max(sic_description) FROM openedgar_companyinfo WHERE sic IS NOT NULL GROUP BY sic""",
+            ],
+            reverse_sql=[
+                """UPDATE openedgar_companyinfo ci SET sic_description = s.description
+FROM openedgar_sic s WHERE s.code = ci.sic""",
+            ],
+        ),
+        migrations.RemoveField(
+            model_name='companyinfo',
+            name='sic_description',
+        ),
+        migrations.AlterField(
+            model_name='companyinfo',
+            name='sic',
+            field=models.ForeignKey(db_column='sic', null=True, on_delete=django.db.models.deletion.PROTECT, to='openedgar.sic'),
+        ),
+    ]
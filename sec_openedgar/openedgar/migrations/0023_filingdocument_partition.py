@@ -0,0 +1,82 @@
+# Generated by Django 5.0.2 on 2026-10-15 14:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Number of hash partitions for openedgar_filingdocument
+PARTITION_COUNT = 32
+
+COLUMNS = "id, filing_id, type_id, sequence, file_name, content_type, description, sha1, start_pos, end_pos, " \
+          "is_processed, is_error"
+
+
+def create_table_sql(table_name: str, partitioned: bool):
+    """
+    Build the filing document table DDL; partitioned tables must include filing_id in every unique key.
+    :param table_name: table to create
+    :param partitioned: hash-partition by filing_id
+    :return:
+    """
+    # Index-backed constraint names must not collide with the table being replaced
+    prefix = "filingdocument_part" if partitioned else "openedgar_filingdocument"
+    primary_key = "PRIMARY KEY (id, filing_id)" if partitioned else "PRIMARY KEY (id)"
+    sql_list = ["""CREATE TABLE {0} (
+    id integer GENERATED BY DEFAULT AS IDENTITY,
+    filing_id integer NOT NULL REFERENCES openedgar_filing (id) DEFERRABLE INITIALLY DEFERRED,
+    type_id smallint NULL REFERENCES openedgar_formtype (id) DEFERRABLE INITIALLY DEFERRED,
+    sequence integer NOT NULL,
+    file_name varchar(1024) NULL,
+    content_type varchar(128) NULL,
+    description varchar(1024) NULL,
+    sha1 bytea NOT NULL,
+    start_pos integer NOT NULL,
+    end_pos integer NOT NULL,
+    is_processed boolean NOT NULL,
+    is_error boolean NOT NULL,
+    CONSTRAINT {1}_pkey {2},
+    CONSTRAINT {1}_filing_sequence_uniq UNIQUE (filing_id, sequence)
+){3}""".format(table_name, prefix, primary_key, " PARTITION BY HASH (filing_id)" if partitioned else "")]
+    if partitioned:
+        sql_list.extend("CREATE TABLE {0}_p{1} PARTITION OF {0} FOR VALUES WITH (MODULUS {2}, REMAINDER {1})"
+                        .format(table_name, remainder, PARTITION_COUNT) for remainder in range(PARTITION_COUNT))
+    return sql_list
+
+
+def swap_table_sql(partitioned: bool):
+    """
+    Copy filing documents into a rebuilt table and swap it in under the original name.
+    :param partitioned: whether the rebuilt table is partitioned
+    :return:
+    """
+    return ["ALTER TABLE openedgar_filingdocument RENAME TO openedgar_filingdocument_old"] + \
+        create_table_sql("openedgar_filingdocument", partitioned) + [
+        "INSERT INTO openedgar_filingdocument ({0}) SELECT {0} FROM openedgar_filingdocument_old".format(COLUMNS),
+        "SELECT setval(pg_get_serial_sequence('openedgar_filingdocument', 'id'), "
+        "coalesce(max(id), 0) + 1, false) FROM openedgar_filingdocument",
+        "DROP TABLE openedgar_filingdocument_old",
+        "CREATE INDEX openedgar_filingdocument_type_id ON openedgar_filingdocument (type_id)",
+        "CREATE INDEX openedgar_filingdocument_sha1 ON openedgar_filingdocument (sha1)",
+        "CREATE INDEX filingdocument_work_idx ON openedgar_filingdocument (is_processed, is_error) "
+        "WHERE NOT is_processed",
+    ]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('openedgar', '0022_sic'),
+    ]
+
+    operations = [
+        # The partitioned table cannot carry a unique key on id alone, so search results lose their constraint
+        migrations.AlterField(
+            model_name='searchqueryresult',
+            name='filing_document',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE,
+                                    to='openedgar.filingdocument'),
+        ),
+        migrations.RunSQL(
+            sql=swap_table_sql(partitioned=True),
+            reverse_sql=swap_table_sql(partitioned=False),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.0.2 on 2026-10-15 14:52
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('openedgar', '0023_filingdocument_partition'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='company',
+            options={'base_manager_name': 'objects', 'ordering': []},
+        ),
+        migrations.AlterModelOptions(
+            name='sic',
+            options={'base_manager_name': 'objects', 'ordering': []},
+        ),
+        migrations.AlterModelOptions(
+            name='companyinfo',
+            options={'base_manager_name': 'objects', 'ordering': []},
+        ),
+        migrations.AlterModelOptions(
+            name='filingindex',
+            options={'base_manager_name': 'objects', 'ordering': []},
+        ),
+        migrations.AlterModelOptions(
+            name='formtype',
+            options={'base_manager_name': 'objects', 'ordering': []},
+        ),
+        migrations.AlterModelOptions(
+            name='httpcache',
+            options={'base_manager_name': 'objects', 'ordering': []},
+        ),
+        migrations.AlterModelOptions(
+            name='filing',
+            options={'base_manager_name': 'objects', 'ordering': []},
+        ),
+        migrations.AlterModelOptions(
+            name='filingdocument',
+            options={'base_manager_name': 'objects', 'ordering': []},
+        ),
+        migrations.AlterModelOptions(
+            name='searchquery',
+            options={'base_manager_name': 'objects', 'ordering': []},
+        ),
+        migrations.AlterModelOptions(
+            name='searchqueryterm',
+            options={'base_manager_name': 'objects', 'ordering': []},
+        ),
+        migrations.AlterModelOptions(
+            name='searchqueryresult',
+            options={'base_manager_name': 'objects', 'ordering': []},
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.0.2 on 2026-10-15 15:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('openedgar', '0024_model_options'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='filing',
+            name='state',
+            field=models.SmallIntegerField(choices=[(0, 'Pending'), (1, 'Processed'), (2, 'Error'), (3, 'Ignored')], default=0),
+        ),
+        migrations.RunSQL(
+            sql="UPDATE openedgar_filing SET state = CASE WHEN is_error THEN 2 WHEN is_processed THEN 1 ELSE 0 END",
+            reverse_sql="UPDATE openedgar_filing SET is_processed = (state = 1), is_error = (state = 2)",
+        ),
+        migrations.RemoveIndex(
+            model_name='filing',
+            name='filing_work_idx',
+        ),
+        migrations.RemoveField(
+            model_name='filing',
+            name='is_error',
+        ),
+        migrations.RemoveField(
+            model_name='filing',
+            name='is_processed',
+        ),
+        migrations.AddIndex(
+            model_name='filing',
+            index=models.Index(condition=models.Q(('state', 0)), fields=['state'], name='filing_pending_idx'),
+        ),
+    ]
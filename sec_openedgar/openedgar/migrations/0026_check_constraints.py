@@ -0,0 +1,27 @@
+# Generated by Django 5.0.2 on 2026-10-15 15:31
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('openedgar', '0025_filing_state'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='companyinfo',
+            name='fiscal_year_end',
+            field=models.CharField(max_length=4, null=True, validators=[django.core.validators.RegexValidator('^[0-9]{4}$')]),
+        ),
+        migrations.AddConstraint(
+            model_name='company',
+            constraint=models.CheckConstraint(check=models.Q(('cik__gt', 0), ('cik__lt', 10000000000)), name='company_cik_range'),
+        ),
+        migrations.AddConstraint(
+            model_name='filing',
+            constraint=models.CheckConstraint(check=models.Q(('accession_number__isnull', True), models.Q(('accession_number__gt', 0), ('accession_number__lt', 1000000000000000000)), _connector='OR'), name='filing_accession_number_range'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.2 on 2026-10-15 15:50
+
+import django.contrib.postgres.fields.ranges
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('openedgar', '0026_check_constraints'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='filing',
+            name='filing_period',
+            field=django.contrib.postgres.fields.ranges.DateRangeField(null=True),
+        ),
+        # Existing filings have no stored period of report, so they start as a single-day range
+        migrations.RunSQL(
+            sql="UPDATE openedgar_filing SET filing_period = daterange(date_filed, date_filed, '[]') "
+                "WHERE date_filed IS NOT NULL",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name='filing',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['filing_period'], name='filing_period_gist'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.2 on 2026-10-15 16:03
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('openedgar', '0027_filing_period'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='companyinfo',
+            name='asof',
+            field=models.DateField(db_index=True, default=django.utils.timezone.localdate),
+        ),
+        migrations.AlterField(
+            model_name='filingindex',
+            name='date_downloaded',
+            field=models.DateField(default=django.utils.timezone.localdate),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.0.2 on 2026-10-15 16:24
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('openedgar', '0028_date_defaults'),
+    ]
+
+    operations = [
+        # Drop the primary key and unique constraints on cik alone, then key rows by a bigint identity
+        migrations.RunSQL(
+            sql=[
+                """DO $$
+DECLARE
+    constraint_name text;
+BEGIN
+    FOR constraint_name IN
+        SELECT c.conname FROM pg_constraint c
+        JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attname = 'cik'
+        WHERE c.conrelid = 'openedgar_companyinfo'::regclass AND c.contype IN ('p', 'u')
+        AND c.conkey = ARRAY[a.attnum]
+    LOOP
+        EXECUTE format('ALTER TABLE openedgar_companyinfo DROP CONSTRAINT %I', constraint_name);
+    END LOOP;
+END $$""",
+                "ALTER TABLE openedgar_companyinfo ADD COLUMN id bigint GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY",
+            ],
+            reverse_sql=[
+                "ALTER TABLE openedgar_companyinfo DROP COLUMN id",
+                "ALTER TABLE openedgar_companyinfo ADD PRIMARY KEY (cik)",
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='companyinfo',
+                    name='cik',
+                    field=models.ForeignKey(db_column='cik', db_index=False, on_delete=django.db.models.deletion.CASCADE, to='openedgar.company'),
+                ),
+                migrations.AddField(
+                    model_name='companyinfo',
+                    name='id',
+                    field=models.BigAutoField(primary_key=True, serialize=False),
+                    preserve_default=False,
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='companyinfo',
+            constraint=models.UniqueConstraint(fields=('cik', 'asof'), name='ci_cik_asof_uniq'),
+        ),
+        migrations.AlterField(
+            model_name='companyinfo',
+            name='asof',
+            field=models.DateField(default=django.utils.timezone.localdate),
+        ),
+        migrations.AddIndex(
+            model_name='companyinfo',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['asof'], name='ci_asof_brin', pages_per_range=32),
+        ),
+    ]
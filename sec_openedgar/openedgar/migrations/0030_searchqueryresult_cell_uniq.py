@@ -0,0 +1,40 @@
+# Generated by Django 5.0.2 on 2026-10-15 16:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('openedgar', '0029_companyinfo_history'),
+    ]
+
+    operations = [
+        # Retried searches may have written the same cell twice; keep the first
+        migrations.RunSQL(
+            sql="""DELETE FROM openedgar_searchqueryresult a USING openedgar_searchqueryresult b
+WHERE a.id > b.id AND a.search_query_id = b.search_query_id
+AND a.filing_document_id = b.filing_document_id AND a.term_id = b.term_id""",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AlterField(
+            model_name='searchqueryresult',
+            name='search_query',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='openedgar.searchquery'),
+        ),
+        migrations.AlterField(
+            model_name='searchqueryresult',
+            name='filing_document',
+            field=models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.CASCADE, to='openedgar.filingdocument'),
+        ),
+        migrations.AlterField(
+            model_name='searchqueryresult',
+            name='term',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='openedgar.searchqueryterm'),
+        ),
+        migrations.AddConstraint(
+            model_name='searchqueryresult',
+            constraint=models.UniqueConstraint(fields=('search_query', 'filing_document', 'term'), name='sqr_cell_uniq'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.2 on 2026-10-15 22:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('openedgar', '0031_searchquery_date_created_db_default'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='filing',
+            name='filing_pending_idx',
+        ),
+        migrations.AddIndex(
+            model_name='filing',
+            index=models.Index(condition=models.Q(('state', 2)), fields=['state'], name='filing_error_idx'),
+        ),
+    ]
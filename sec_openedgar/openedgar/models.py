@@ -23,9 +23,221 @@ SOFTWARE.
 """
 
 # Package imports
+import csv
 import datetime
+import functools
+import io
+import itertools
+import json
+from typing import Iterable
+
+import django.core.validators
+import django.db
+import django.db.transaction
 import django.db.models
-from django.contrib.postgres.fields import ArrayField
+import django.db.models.functions
+from django.contrib.postgres.fields import ArrayField, DateRangeField
+from django.contrib.postgres.indexes import BrinIndex, GinIndex, GistIndex
+from django.db.backends.postgresql.psycopg_any import DateRange
+
+# Project
+from config.settings.base import BULK_CREATE_BATCH_SIZE
+
+
+class BulkInsertMixin:
+    """
+    Mixin providing batched multi-row inserts and COPY loads for high-volume models.
+    """
+
+    @classmethod
+    def bulk_insert(cls, rows: Iterable[dict], batch_size: int = BULK_CREATE_BATCH_SIZE):
+        """
+        Insert rows in batches, skipping any that conflict with existing records.
+        :param rows: iterable of field name to value dicts
+        :param batch_size: number of rows per INSERT statement
+        :return: list of instances passed to the database
+        """
+        return cls.objects.bulk_create([cls(**row) for row in rows], batch_size=batch_size, ignore_conflicts=True)
+
+    @classmethod
+    def bulk_upsert(cls, rows: Iterable[dict], unique_fields: Iterable[str], update_fields: Iterable[str],
+                    batch_size: int = BULK_CREATE_BATCH_SIZE):
+        """
+        Insert rows in batches within one transaction, updating any that conflict with existing records.
+        :param rows: iterable of field name to value dicts
+        :param unique_fields: fields of the unique constraint that identifies a conflict
+        :param update_fields: fields to overwrite on conflict
+        :param batch_size: number of rows per INSERT statement
+        :return: list of instances passed to the database
+        """
+        with django.db.transaction.atomic():
+            return cls.objects.bulk_create([cls(**row) for row in rows], batch_size=batch_size, update_conflicts=True,
+                                           unique_fields=list(unique_fields), update_fields=list(update_fields))
+
+    @staticmethod
+    def _copy_value(value):
+        """
+        Format a value for a CSV COPY stream; None is left for the writer to emit as NULL.
+        :param value: python value
+        :return:
+        """
+        if value is None or isinstance(value, str):
+            return value
+        if isinstance(value, bool):
+            return "t" if value else "f"
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return "\\x" + bytes(value).hex()
+        if isinstance(value, dict):
+            return json.dumps(value)
+        if isinstance(value, django.db.models.Model):
+            return value.pk
+        return value
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _copy_spec(cls):
+        """
+        Fields and COPY statement for this model, computed once per class.
+        :return: tuple of copied fields, COPY statement
+        """
+        # Copy every concrete column except auto keys
+        field_list = tuple(field for field in cls._meta.concrete_fields
+                           if not isinstance(field, django.db.models.AutoField))
+        copy_sql = "COPY {0} ({1}) FROM STDIN WITH (FORMAT csv)" \
+            .format(cls._meta.db_table, ", ".join('"{0}"'.format(field.column) for field in field_list))
+        return field_list, copy_sql
+
+    @classmethod
+    def bulk_copy(cls, rows: Iterable[dict], batch_size: int = 50000):
+        """
+        Load rows with PostgreSQL COPY, committing every batch_size rows. Unlike bulk_insert,
+        conflicting rows abort the batch, so this is meant for loading new data.
+        :param rows: iterable of field name to value dicts; foreign keys may be given as ids by attname
+        :param batch_size: number of rows per COPY and transaction
+        :return: number of rows copied
+        """
+        field_list, copy_sql = cls._copy_spec()
+
+        row_iter = iter(rows)
+        row_count = 0
+        while True:
+            batch = list(itertools.islice(row_iter, batch_size))
+            if len(batch) == 0:
+                break
+
+            copy_buffer = cls._copy_buffer(batch, field_list)
+            with django.db.transaction.atomic(), django.db.connection.cursor() as cursor:
+                cursor.copy_expert(copy_sql, copy_buffer)
+            row_count += len(batch)
+
+        return row_count
+
+    @classmethod
+    def _copy_buffer(cls, rows: Iterable[dict], field_list):
+        """
+        Write rows to a CSV buffer for COPY.
+        :param rows: iterable of field name to value dicts
+        :param field_list: fields to write, in column order
+        :return: buffer positioned at the start
+        """
+        # QUOTE_NOTNULL writes None unquoted, which COPY reads as NULL, and quotes everything else;
+        # missing keys take the field's Python-side default
+        copy_buffer = io.StringIO()
+        writer = csv.writer(copy_buffer, quoting=csv.QUOTE_NOTNULL)
+        for row in rows:
+            writer.writerow([cls._copy_value(row[field.attname] if field.attname in row else
+                                             row[field.name] if field.name in row else field.get_default())
+                             for field in field_list])
+        copy_buffer.seek(0)
+        return copy_buffer
+
+    @classmethod
+    def bulk_copy_insert(cls, rows: Iterable[dict], batch_size: int = 50000, unique_fields: Iterable[str] = None,
+                         update_fields: Iterable[str] = None):
+        """
+        Load rows with PostgreSQL COPY into a temporary staging table, then insert them, skipping any
+        that conflict with existing records as bulk_insert does, or updating them as bulk_upsert does.
+        :param rows: iterable of field name to value dicts; foreign keys may be given as ids by attname
+        :param batch_size: number of rows per COPY and transaction
+        :param unique_fields: fields of the unique constraint that identifies a conflict, to update on conflict
+        :param update_fields: fields to overwrite on conflict; requires unique_fields
+        :return: number of rows inserted or updated
+        """
+        field_list, _ = cls._copy_spec()
+        table_name = cls._meta.db_table
+        staging_name = "{0}_staging".format(table_name)
+        column_list = ", ".join('"{0}"'.format(field.column) for field in field_list)
+
+        # Conflicting rows are skipped unless update fields are given
+        if unique_fields and update_fields:
+            conflict_sql = "ON CONFLICT ({0}) DO UPDATE SET {1}".format(
+                ", ".join('"{0}"'.format(cls._meta.get_field(name).column) for name in unique_fields),
+                ", ".join('"{0}" = EXCLUDED."{0}"'.format(cls._meta.get_field(name).column) for name in update_fields))
+        else:
+            conflict_sql = "ON CONFLICT DO NOTHING"
+
+        row_iter = iter(rows)
+        row_count = 0
+        while True:
+            batch = list(itertools.islice(row_iter, batch_size))
+            if len(batch) == 0:
+                break
+
+            copy_buffer = cls._copy_buffer(batch, field_list)
+            with django.db.transaction.atomic(), django.db.connection.cursor() as cursor:
+                # Staging table has the copied columns only, without keys or constraints; it is dropped after each
+                # batch, since inside an outer transaction ON COMMIT DROP would keep it until the outer commit
+                cursor.execute('CREATE TEMPORARY TABLE "{0}" AS SELECT {1} FROM "{2}" WITH NO DATA'
+                               .format(staging_name, column_list, table_name))
+                cursor.copy_expert('COPY "{0}" ({1}) FROM STDIN WITH (FORMAT csv)'.format(staging_name, column_list),
+                                   copy_buffer)
+                cursor.execute('INSERT INTO "{0}" ({1}) SELECT {1} FROM "{2}" {3}'
+                               .format(table_name, column_list, staging_name, conflict_sql))
+                row_count += cursor.rowcount
+                cursor.execute('DROP TABLE "{0}"'.format(staging_name))
+
+        return row_count
+
+
+class LookupManager(django.db.models.Manager):
+    """
+    Manager for small, rarely changing lookup tables, caching every record per process.
+    """
+
+    def __init__(self, key_field: str):
+        super().__init__()
+        self.key_field = key_field
+        self.cache = {}
+        self.is_warm = False
+
+    def warm(self):
+        """
+        Load the whole table into the cache with a single query.
+        :return:
+        """
+        self.cache.update((getattr(record, self.key_field), record) for record in self.all())
+        self.is_warm = True
+
+    def clear_cache(self):
+        """
+        Drop cached records, e.g., after the table is edited outside of get_cached.
+        :return:
+        """
+        self.cache.clear()
+        self.is_warm = False
+
+    def get_cached(self, key, **defaults):
+        """
+        Get a record by key from the cache, creating it if it does not exist yet.
+        :param key: value of the key field
+        :param defaults: field values used if the record is created
+        :return:
+        """
+        if not self.is_warm:
+            self.warm()
+        if key not in self.cache:
+            self.cache[key] = self.get_or_create(defaults=defaults, **{self.key_field: key})[0]
+        return self.cache[key]
 
 
 class Company(django.db.models.Model):
@@ -37,143 +249,438 @@ class Company(django.db.models.Model):
     cik = django.db.models.BigIntegerField(db_index=True, primary_key=True, unique=True)
     cik_name = django.db.models.CharField(max_length=1024, db_index=True)
 
+    class Meta:
+        # No implicit ORDER BY, and related lookups always use the manager declared here
+        ordering = []
+        base_manager_name = "objects"
+        constraints = [
+            # CIKs are positive and at most ten digits
+            django.db.models.CheckConstraint(check=django.db.models.Q(cik__gt=0, cik__lt=10 ** 10),
+                                             name="company_cik_range"),
+        ]
+
+    def __str__(self):
+        """
+        String representation method
+        :return:
+        """
+        return f"Company cik={self.cik}, cik_name={self.cik_name}"
+
+
+class SIC(django.db.models.Model):
+    """
+    Standard Industrial Classification code and its description.
+    """
+
+    # Key fields
+    code = django.db.models.CharField(max_length=4, primary_key=True)
+    description = django.db.models.CharField(max_length=1024, null=True)
+
+    objects = LookupManager("code")
+
+    class Meta:
+        ordering = []
+        base_manager_name = "objects"
+
     def __str__(self):
         """
         String representation method
         :return:
         """
-        return "Company cik={0}, cik_name={1}" \
-            .format(self.cik, self.cik_name) \
-            .encode("utf-8", "ignore") \
-            .decode("utf-8", "ignore")
+        return f"SIC code={self.code}, description={self.description}"
+
+    @classmethod
+    def get_code(cls, code: str, description: str = None):
+        """
+        Get a SIC code for use as a foreign key value, creating the record if needed.
+        :param code: four-digit SIC code
+        :param description: SIC description, used if the code is new
+        :return:
+        """
+        if not code:
+            return None
+        return cls.objects.get_cached(code, description=description).code
+
+
+class CompanyInfoQuerySet(django.db.models.QuerySet):
+    """
+    Company info queryset with a narrow column set for listings.
+    """
+
+    def lite(self):
+        """
+        Load only the identifying columns, leaving the JSON and array columns deferred.
+        :return:
+        """
+        return self.only("cik", "name", "sic", "state_of_incorporation", "asof")
 
 
 class CompanyInfo(django.db.models.Model):
     """
     Company info, which stores a name, SIC, and other data associated with
-    a CIK/security on a given date.
+    a CIK/security on a given date; one row per CIK and asof date.
     """
     # Fields
-    cik = django.db.models.ForeignKey(Company, db_column='cik', primary_key=True, unique=True, db_index=True, on_delete=django.db.models.CASCADE)
+    id = django.db.models.BigAutoField(primary_key=True)
+    cik = django.db.models.ForeignKey(Company, db_column='cik', db_index=False, on_delete=django.db.models.CASCADE)
     name = django.db.models.CharField(max_length=1024, db_index=True)
     is_company = django.db.models.BooleanField()
     category = django.db.models.CharField(max_length=1024, null=True)
     description = django.db.models.CharField(max_length=1024, null=True)
-    entity_type = django.db.models.CharField(max_length=1024, null=True)
-    ein = django.db.models.CharField(max_length=1024, null=True)
+    entity_type = django.db.models.CharField(max_length=64, null=True)
+    ein = django.db.models.CharField(max_length=16, null=True)
     industry = django.db.models.CharField(max_length=1024, db_index=True, null=True)
-    sic = django.db.models.CharField(max_length=4, db_index=True, null=True)
-    sic_description = django.db.models.CharField(max_length=1024, db_index=True, null=True)
+    sic = django.db.models.ForeignKey(SIC, db_column="sic", db_index=True, on_delete=django.db.models.PROTECT,
+                                      null=True)
     state_of_incorporation = django.db.models.CharField(max_length=32, db_index=True, null=True)
     state_of_incorporation_description = django.db.models.CharField(max_length=1024, null=True)
-    fiscal_year_end = django.db.models.CharField(max_length=1024, null=True)
+    fiscal_year_end = django.db.models.CharField(max_length=4, null=True,
+                                                 validators=[django.core.validators.RegexValidator(r"^[0-9]{4}$")])
     mailing_address = django.db.models.JSONField(null=True)
     business_address = django.db.models.JSONField(null=True)
+    business_city = django.db.models.CharField(max_length=1024, null=True)
+    business_state = django.db.models.CharField(max_length=2, db_index=True, null=True)
+    business_zip = django.db.models.CharField(max_length=16, null=True)
     phone = django.db.models.CharField(max_length=20, null=True)
     tickers = ArrayField(django.db.models.CharField(max_length=14), null=True)
-    exchanges = ArrayField(django.db.models.CharField(max_length=1024), null=True)
+    exchanges = ArrayField(django.db.models.CharField(max_length=32), null=True)
     former_names = django.db.models.JSONField(null=True)
     flags = django.db.models.CharField(max_length=1024, null=True)
     insider_transaction_for_owner_exists = django.db.models.SmallIntegerField()
     insider_transaction_for_issuer_exists = django.db.models.SmallIntegerField()
     website = django.db.models.CharField(max_length=1024, null=True)
     investor_website = django.db.models.CharField(max_length=1024, null=True)
-    asof = django.db.models.DateField(default=django.utils.timezone.now, db_index=True)
-    
+    asof = django.db.models.DateField(default=django.utils.timezone.localdate)
+
+    objects = CompanyInfoQuerySet.as_manager()
+
+    class Meta:
+        ordering = []
+        base_manager_name = "objects"
+        constraints = [
+            # Fiscal year end is reported as MMDD
+            django.db.models.CheckConstraint(check=django.db.models.Q(fiscal_year_end__regex=r"^([0-9]{4})?$"),
+                                             name="companyinfo_fiscal_year_end_mmdd"),
+            # History is kept per day; the unique index also serves lookups by CIK
+            django.db.models.UniqueConstraint(fields=["cik", "asof"], name="ci_cik_asof_uniq"),
+        ]
+        indexes = [
+            # Rows are appended as companies are refreshed, so asof follows physical order
+            BrinIndex(fields=["asof"], pages_per_range=32, name="ci_asof_brin"),
+            # jsonb_path_ops serves @> containment lookups on address keys with a compact index
+            GinIndex(fields=["business_address"], opclasses=["jsonb_path_ops"], name="ci_biz_addr_gin"),
+            GinIndex(fields=["mailing_address"], opclasses=["jsonb_path_ops"], name="ci_mail_addr_gin"),
+            # Ticker and exchange lookups should use tickers__contains=["AAPL"] to hit these
+            GinIndex(fields=["tickers"], name="ci_tickers_gin"),
+            GinIndex(fields=["exchanges"], name="ci_exch_gin"),
+        ]
+
     def __str__(self):
         """
         String representation method
         :return:
         """
-        return "CompanyInfo cik={0}, name={1}, date={2}" \
-            .format(self.company.cik, self.name, self.date) \
-            .encode("utf-8", "ignore") \
-            .decode("utf-8", "ignore")
+        return f"CompanyInfo cik={self.cik_id}, name={self.name}, asof={self.asof}"
 
 
-class FilingIndex(django.db.models.Model):
+class FilingIndex(BulkInsertMixin, django.db.models.Model):
     """
     Filing index, which stores links to forms grouped
     by various dimensions such as form type or CIK.
     """
 
     # Key fields
-    edgar_url = django.db.models.CharField(max_length=1024, primary_key=True)
+    id = django.db.models.BigAutoField(primary_key=True)
+    edgar_url = django.db.models.CharField(max_length=1024, unique=True)
     date_published = django.db.models.DateField(db_index=True, null=True)
-    date_downloaded = django.db.models.DateField(default=django.utils.timezone.now, db_index=True)
+    date_downloaded = django.db.models.DateField(default=django.utils.timezone.localdate)
     total_record_count = django.db.models.IntegerField(default=0)
     bad_record_count = django.db.models.IntegerField(default=0)
-    is_processed = django.db.models.BooleanField(default=False, db_index=True)
-    is_error = django.db.models.BooleanField(default=False, db_index=True)
+    is_processed = django.db.models.BooleanField(default=False)
+    is_error = django.db.models.BooleanField(default=False)
+
+    class Meta:
+        ordering = []
+        base_manager_name = "objects"
+        # Only unprocessed indexes are looked up by flag, so index just those rows
+        indexes = [
+            django.db.models.Index(fields=["is_processed", "is_error"], name="filingindex_work_idx",
+                                   condition=django.db.models.Q(is_processed=False)),
+            # Rows are appended as indexes are downloaded, so download dates follow physical order
+            BrinIndex(fields=["date_downloaded"], pages_per_range=32, name="filingindex_downloaded_brin"),
+        ]
+
+    def __str__(self):
+        """
+        String representation method
+        :return:
+        """
+        return f"FilingIndex edgar_url={self.edgar_url}, date_published={self.date_published}"
+
+
+class FormType(django.db.models.Model):
+    """
+    Form type, which stores the small set of distinct form and document
+    type names referenced by filings and filing documents.
+    """
+
+    # Key fields
+    id = django.db.models.SmallAutoField(primary_key=True)
+    name = django.db.models.CharField(max_length=64, unique=True)
+
+    objects = LookupManager("name")
+
+    class Meta:
+        ordering = []
+        base_manager_name = "objects"
 
     def __str__(self):
         """
         String representation method
         :return:
         """
-        return "FilingIndex edgar_url={0}, date_published={1}" \
-            .format(self.edgar_url, self.date_published) \
-            .encode("utf-8", "ignore") \
-            .decode("utf-8", "ignore")
+        return f"FormType id={self.id}, name={self.name}"
+
+    @classmethod
+    def get_id(cls, name: str):
+        """
+        Get the id for a form type name, creating the record if needed.
+        :param name: form type name, e.g., 10-K
+        :return:
+        """
+        if not name:
+            return None
+        return cls.objects.get_cached(name).id
+
+
+class HttpCache(django.db.models.Model):
+    """
+    HTTP cache entry, which stores validators and content for EDGAR
+    pages so unchanged pages can be revalidated without a full transfer.
+    """
+
+    # Key fields
+    url = django.db.models.CharField(max_length=1024, primary_key=True)
+    etag = django.db.models.CharField(max_length=256, null=True)
+    last_modified = django.db.models.CharField(max_length=64, null=True)
+    sha1 = django.db.models.BinaryField(max_length=20, null=True)
+    content = django.db.models.BinaryField(null=True)
+    date_updated = django.db.models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = []
+        base_manager_name = "objects"
+
+    def __str__(self):
+        """
+        String representation method
+        :return:
+        """
+        return f"HttpCache url={self.url}, etag={self.etag}, last_modified={self.last_modified}"
+
+
+class FilingState(django.db.models.IntegerChoices):
+    """
+    Processing state of a filing.
+    """
+    PENDING = 0
+    PROCESSED = 1
+    ERROR = 2
+    IGNORED = 3
+
+
+class FilingQuerySet(django.db.models.QuerySet):
+    """
+    Filing queryset with helpers to load related records up front.
+    """
+
+    def with_relations(self):
+        """
+        Join the single-valued company and form type relations into the same query.
+        :return:
+        """
+        return self.select_related("company", "form_type")
+
+    def with_documents(self):
+        """
+        Load each filing's documents in one additional query.
+        :return:
+        """
+        return self.prefetch_related(
+            django.db.models.Prefetch("filingdocument_set",
+                                      queryset=FilingDocument.objects.select_related("type")
+                                      .only("id", "filing_id", "sequence", "type", "sha1")))
+
+
+class FilingDocumentQuerySet(django.db.models.QuerySet):
+    """
+    Filing document queryset with helpers to load related records up front.
+    """
+
+    def with_relations(self):
+        """
+        Join the document type and parent filing, including the filing's company and form type.
+        :return:
+        """
+        return self.select_related("type", "filing__company", "filing__form_type")
 
 
-class Filing(django.db.models.Model):
+class Filing(BulkInsertMixin, django.db.models.Model):
     """
     Filing, which stores a single filing record from an index.
     """
 
     # Key fields
-    form_type = django.db.models.CharField(max_length=64, db_index=True, null=True)
-    accession_number = django.db.models.CharField(max_length=1024, null=True)
-    date_filed = django.db.models.DateField(db_index=True, null=True)
-    company = django.db.models.ForeignKey(Company, db_index=True, on_delete=django.db.models.CASCADE, null=True)
-    sha1 = django.db.models.CharField(max_length=1024, db_index=True, null=True)
+    form_type = django.db.models.ForeignKey(FormType, db_index=False, on_delete=django.db.models.PROTECT, null=True)
+    accession_number = django.db.models.BigIntegerField(db_index=True, null=True)
+    date_filed = django.db.models.DateField(null=True)
+    filing_period = DateRangeField(null=True)
+    company = django.db.models.ForeignKey(Company, db_index=False, on_delete=django.db.models.CASCADE, null=True)
+    sha1 = django.db.models.BinaryField(max_length=20, db_index=True, null=True)
     s3_path = django.db.models.CharField(max_length=1024, db_index=True)
     document_count = django.db.models.IntegerField(default=0)
-    is_processed = django.db.models.BooleanField(default=False, db_index=True)
-    is_error = django.db.models.BooleanField(default=False, db_index=True)
+    state = django.db.models.SmallIntegerField(choices=FilingState.choices, default=FilingState.PENDING)
+
+    objects = FilingQuerySet.as_manager()
+
+    class Meta:
+        ordering = []
+        base_manager_name = "objects"
+        constraints = [
+            # Packed accession numbers are at most 18 digits
+            django.db.models.CheckConstraint(check=django.db.models.Q(accession_number__isnull=True) |
+                                             django.db.models.Q(accession_number__gt=0,
+                                                                accession_number__lt=10 ** 18),
+                                             name="filing_accession_number_range"),
+        ]
+        # Composite indexes matching filing lookups; the partial index only covers filings left to retry, since
+        # filings are recorded as errors until their documents are stored
+        indexes = [
+            django.db.models.Index(fields=["form_type", "date_filed"], name="filing_form_date_idx"),
+            django.db.models.Index(fields=["company", "form_type"], name="filing_company_form_idx"),
+            django.db.models.Index(fields=["state"], name="filing_error_idx",
+                                   condition=django.db.models.Q(state=FilingState.ERROR)),
+            # Filings arrive roughly in date order, so a BRIN index covers date ranges at a fraction of the size
+            BrinIndex(fields=["date_filed"], pages_per_range=32, name="filing_date_filed_brin"),
+            # Overlap lookups such as filing_period__overlap=DateRange(q_start, q_end) use one GiST descent
+            GistIndex(fields=["filing_period"], name="filing_period_gist"),
+        ]
 
     def __str__(self):
         """
         String representation method
         :return:
         """
-        return "Filing id={0}, cik={1}, form_type={2}, date_filed={3}" \
-            .format(self.id, self.company.cik if self.company else None, self.form_type, self.date_filed) \
-            .encode("utf-8", "ignore") \
-            .decode("utf-8", "ignore")
+        return f"Filing id={self.id}, cik={self.company_id}, form_type_id={self.form_type_id}, " \
+            f"date_filed={self.date_filed}"
+
+    @property
+    def sha1_hex(self):
+        """
+        Hex form of the raw sha1 digest, as used in S3 paths
+        :return:
+        """
+        return bytes(self.sha1).hex() if self.sha1 is not None else None
 
+    @property
+    def is_processed(self):
+        """
+        Whether the filing was processed successfully
+        :return:
+        """
+        return self.state == FilingState.PROCESSED
 
-class FilingDocument(django.db.models.Model):
+    @property
+    def is_error(self):
+        """
+        Whether processing the filing failed
+        :return:
+        """
+        return self.state == FilingState.ERROR
+
+    @property
+    def accession_str(self):
+        """
+        Dashed NNNNNNNNNN-NN-NNNNNN form of the packed accession number
+        :return:
+        """
+        if self.accession_number is None:
+            return None
+        accession = "{0:018d}".format(self.accession_number)
+        return "{0}-{1}-{2}".format(accession[0:10], accession[10:12], accession[12:18])
+
+    @staticmethod
+    def build_filing_period(reporting_period: datetime.date, date_filed: datetime.date):
+        """
+        Build the inclusive interval from the period of report through the filing date
+        :param reporting_period: conformed period of report, if any
+        :param date_filed: filing date
+        :return:
+        """
+        if date_filed is None:
+            return None
+        if reporting_period is None or reporting_period > date_filed:
+            reporting_period = date_filed
+        return DateRange(reporting_period, date_filed, bounds="[]")
+
+    @staticmethod
+    def parse_accession_number(accession: str):
+        """
+        Pack a dashed accession number into its 18-digit integer form
+        :param accession: accession number, e.g., 0000950134-05-005462
+        :return:
+        """
+        if not accession:
+            return None
+        digits = accession.replace("-", "").strip()
+        return int(digits) if digits.isdigit() else None
+
+
+class FilingDocument(BulkInsertMixin, django.db.models.Model):
     """
     Filing document, which corresponds to a <DOCUMENT>...</DOCUMENT> section of a <SEC-DOCUMENT>.
+    The table is hash-partitioned by filing_id; see migration 0023.
     """
 
     # Key fields
-    filing = django.db.models.ForeignKey(Filing, db_index=True, on_delete=django.db.models.CASCADE)
-    type = django.db.models.CharField(max_length=1024, db_index=True, null=True)
-    sequence = django.db.models.IntegerField(db_index=True, default=0)
+    filing = django.db.models.ForeignKey(Filing, db_index=False, on_delete=django.db.models.CASCADE)
+    type = django.db.models.ForeignKey(FormType, db_index=True, on_delete=django.db.models.PROTECT, null=True)
+    sequence = django.db.models.IntegerField(default=0)
     file_name = django.db.models.CharField(max_length=1024, null=True)
-    content_type = django.db.models.CharField(max_length=1024, null=True)
+    content_type = django.db.models.CharField(max_length=128, null=True)
     description = django.db.models.CharField(max_length=1024, null=True)
-    sha1 = django.db.models.CharField(max_length=1024, db_index=True)
-    start_pos = django.db.models.IntegerField(db_index=True)
-    end_pos = django.db.models.IntegerField(db_index=True)
-    is_processed = django.db.models.BooleanField(default=False, db_index=True)
-    is_error = django.db.models.BooleanField(default=False, db_index=True)
+    sha1 = django.db.models.BinaryField(max_length=20, db_index=True)
+    start_pos = django.db.models.IntegerField()
+    end_pos = django.db.models.IntegerField()
+    is_processed = django.db.models.BooleanField(default=False)
+    is_error = django.db.models.BooleanField(default=False)
+
+    objects = FilingDocumentQuerySet.as_manager()
 
     class Meta:
+        ordering = []
+        base_manager_name = "objects"
+        # The (filing, sequence) unique index also serves lookups by filing alone
         unique_together = ('filing', 'sequence')
+        indexes = [
+            django.db.models.Index(fields=["is_processed", "is_error"], name="filingdocument_work_idx",
+                                   condition=django.db.models.Q(is_processed=False)),
+        ]
 
     def __str__(self):
         """
         String representation method
         :return:
         """
-        return "FilingDocument id={0}, filing={1}, sequence={2}" \
-            .format(self.id, self.filing, self.sequence) \
-            .encode("utf-8", "ignore") \
-            .decode("utf-8", "ignore")
+        return f"FilingDocument id={self.id}, filing_id={self.filing_id}, sequence={self.sequence}"
+
+    @property
+    def sha1_hex(self):
+        """
+        Hex form of the raw sha1 digest, as used in S3 paths
+        :return:
+        """
+        return bytes(self.sha1).hex() if self.sha1 is not None else None
 
 
 class SearchQuery(django.db.models.Model):
@@ -181,15 +688,19 @@ class SearchQuery(django.db.models.Model):
     Search query object
     """
     form_type = django.db.models.CharField(max_length=64, db_index=True, null=True)
-    date_created = django.db.models.DateTimeField(default=datetime.datetime.now)
+    date_created = django.db.models.DateTimeField(db_default=django.db.models.functions.Now())
     date_completed = django.db.models.DateTimeField(null=True)
 
+    class Meta:
+        ordering = []
+        base_manager_name = "objects"
+
     def __str__(self):
         """
         String rep
         :return:
         """
-        return "SearchQuery id={0}".format(self.id)
+        return f"SearchQuery id={self.id}"
 
 
 class SearchQueryTerm(django.db.models.Model):
@@ -200,6 +711,8 @@ class SearchQueryTerm(django.db.models.Model):
     term = django.db.models.CharField(max_length=128)
 
     class Meta:
+        ordering = []
+        base_manager_name = "objects"
         unique_together = ('search_query', 'term')
 
     def __str__(self):
@@ -207,21 +720,32 @@ class SearchQueryTerm(django.db.models.Model):
         String rep
         :return:
         """
-        return "SearchQueryTerm search_query={0}, term={1}".format(self.search_query, self.term)
+        return f"SearchQueryTerm search_query_id={self.search_query_id}, term={self.term}"
 
 
 class SearchQueryResult(django.db.models.Model):
     """
     Search result object
     """
-    search_query = django.db.models.ForeignKey(SearchQuery, db_index=True, on_delete=django.db.models.CASCADE)
-    filing_document = django.db.models.ForeignKey(FilingDocument, db_index=True, on_delete=django.db.models.CASCADE)
-    term = django.db.models.ForeignKey(SearchQueryTerm, db_index=True, on_delete=django.db.models.CASCADE)
+    search_query = django.db.models.ForeignKey(SearchQuery, db_index=False, on_delete=django.db.models.CASCADE)
+    # FilingDocument is hash-partitioned by filing, so its id alone cannot back a database constraint
+    filing_document = django.db.models.ForeignKey(FilingDocument, db_index=False, db_constraint=False,
+                                                  on_delete=django.db.models.CASCADE)
+    term = django.db.models.ForeignKey(SearchQueryTerm, db_index=False, on_delete=django.db.models.CASCADE)
     count = django.db.models.IntegerField(default=0)
 
+    class Meta:
+        ordering = []
+        base_manager_name = "objects"
+        constraints = [
+            # One sparse (document, term) cell per query; also the only index, led by the query
+            django.db.models.UniqueConstraint(fields=["search_query", "filing_document", "term"], name="sqr_cell_uniq"),
+        ]
+
     def __str__(self):
         """
         String rep
         :return:
         """
-        return "SearchQueryTerm search_query={0}, term={1}".format(self.search_query, self.term)
+        return f"SearchQueryResult search_query_id={self.search_query_id}, term_id={self.term_id}, " \
+            f"count={self.count}"
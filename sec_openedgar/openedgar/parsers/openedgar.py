@@ -36,6 +36,8 @@ from typing import Union
 
 # Packages
 import dateutil.parser
+import lxml.etree
+import lxml.html
 import pandas
 import tika.parser
 
@@ -51,6 +53,12 @@ formatter = logging.Formatter('%(name)-12s: %(levelname)-8s %(message)s')
 console.setFormatter(formatter)
 logger.addHandler(console)
 
+# HTML elements whose text is separated from the following text when extracted, as a browser would lay it out
+_HTML_BLOCK_TAGS = ("address", "article", "blockquote", "br", "caption", "center", "dd", "div", "dl", "dt", "footer",
+                    "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "ol", "p", "pre", "section",
+                    "table", "title", "tr", "ul")
+_HTML_CELL_TAGS = ("td", "th")
+
 
 def uudecode(buffer: Union[bytes, str]):
     """
@@ -88,13 +96,36 @@ def uudecode(buffer: Union[bytes, str]):
     return out_file.getvalue()
 
 
-def extract_text(buffer: Union[bytes, str]):
+def extract_text(buffer: Union[bytes, str], content_type: str = None):
     """
-    Extract text from a document using tika.
-    :param buffer: buffer to send to tika
+    Extract text from a document, in-process for plain text and HTML and using tika otherwise.
+    :param buffer: document buffer
+    :param content_type: document content type, if known
     :return:
     """
-    # Extract HTML using Tika
+    # Plain text and HTML don't need a round trip to the Tika server
+    if content_type == "text/plain":
+        return buffer.decode("utf-8", errors="replace") if isinstance(buffer, bytes) else buffer
+    if content_type == "text/html":
+        # Parse as UTF-8, since lxml would otherwise guess latin-1 for bytes without a charset declaration
+        if isinstance(buffer, str):
+            buffer = buffer.encode("utf-8")
+        try:
+            document = lxml.html.document_fromstring(buffer, parser=lxml.html.HTMLParser(encoding="utf-8"))
+            # Script and style contents are not document text
+            for element in document.xpath("//script|//style"):
+                element.drop_tree()
+
+            # Separate blocks with newlines and table cells with tabs, so adjacent elements' words do not run together
+            for element in document.iter(*_HTML_BLOCK_TAGS):
+                element.tail = "\n" + (element.tail or "")
+            for element in document.iter(*_HTML_CELL_TAGS):
+                element.tail = "\t" + (element.tail or "")
+            return document.text_content()
+        except (lxml.etree.ParserError, ValueError) as e:
+            logger.warning("Unable to parse HTML locally, falling back to Tika: %s", e)
+
+    # Extract everything else using Tika
     tika_results = tika.parser.from_buffer(buffer, TIKA_ENDPOINT)
 
     if "content" in tika_results:
@@ -115,32 +146,40 @@ def parse_index_file(file_name: str, double_gz: bool = False):
         if os.path.exists(file_name + ".gz"):
             file_name += ".gz"
         else:
-            logger.error("File {0} does not exist on filesystem.".format(file_name))
+            logger.error("File %s does not exist on filesystem.", file_name)
             return pandas.DataFrame()
 
-    logger.info("Parsing index file: {0}".format(file_name))
+    logger.info("Parsing index file: %s", file_name)
 
     # Read index
+    with open(file_name, "rb") as index_file:
+        return parse_index_buffer(index_file.read(), double_gz=double_gz, name=file_name)
+
+
+def parse_index_buffer(buffer: bytes, double_gz: bool = False, name: str = "buffer"):
+    """
+    Parse an index from its raw, possibly compressed, contents.
+    :param buffer:
+    :param double_gz:
+    :param name: file name used in log messages
+    :return:
+    """
+    # Decompress index
     try:
-        with gzip.open(file_name, "rb") as index_file:
-            index_buffer = index_file.read()
-    except IOError as e:
-        logger.error("IOError parsing {0}: {1}".format(file_name, e))
-        # Read as plain binary
-        with open(file_name, "rb") as index_file:
-            index_buffer = index_file.read()
+        index_buffer = gzip.decompress(buffer)
+    except (OSError, EOFError) as e:
+        logger.error("IOError parsing %s: %s", name, e)
+        index_buffer = buffer
 
         # Check for alternative header
-        if index_buffer[0] == '\x78' and (ord(index_buffer[1]) + 0x7800) % 31 == 0:
-            index_buffer = zlib.decompress(index_buffer).decode("utf-8")
-            logger.info("gz with valid header: decompressing {0} to {1} bytes.".format(file_name,
-                                                                                       len(index_buffer)))
+        if len(index_buffer) > 1 and index_buffer[0] == 0x78 and (index_buffer[0] * 256 + index_buffer[1]) % 31 == 0:
+            index_buffer = zlib.decompress(index_buffer)
+            logger.info("gz with valid header: decompressing %s to %s bytes.", name, len(index_buffer))
 
         # Check for double-gz
         if double_gz:
-            index_buffer = os.popen("gunzip -c {0} | gunzip -c".format(file_name)).read() \
-                .decode("utf-8", "ignore").decode("utf-8", "ignore")
-            logger.warning("Double-decompressing buffer for {0}".format(file_name))
+            index_buffer = gzip.decompress(gzip.decompress(buffer))
+            logger.warning("Double-decompressing buffer for %s", name)
 
     # Re-code to UTF-8
     try:
@@ -148,23 +187,18 @@ def parse_index_file(file_name: str, double_gz: bool = False):
     except UnicodeDecodeError as _:
         # Check for double-compression
         try:
-            index_buffer = gzip.GzipFile(fileobj=io.BytesIO(index_buffer)).read().encode("utf-8").decode("utf-8")
+            index_buffer = gzip.decompress(index_buffer).decode("utf-8")
         except UnicodeDecodeError as _:
             try:
-                index_buffer = os.popen("gunzip -c {0} | gunzip -c".format(file_name)).read() \
-                    .decode("utf-8", "ignore").decode("utf-8", "ignore")
-                logger.warning("Double-decompressing buffer for {0}".format(file_name))
-            except UnicodeDecodeError as g:
-                logger.error("Error decoding {0}: {1}".format(file_name, g))
-                logger.error("First 10 bytes: {0}".format(index_buffer[0:10]))
-                return pandas.DataFrame()
-            except OSError as h:
-                logger.error("Error decoding {0}: {1}".format(file_name, h))
-                logger.error("First 10 bytes: {0}".format(index_buffer[0:10]))
+                index_buffer = gzip.decompress(gzip.decompress(buffer)).decode("utf-8", "ignore")
+                logger.warning("Double-decompressing buffer for %s", name)
+            except (OSError, EOFError) as g:
+                logger.error("Error decoding %s: %s", name, g)
+                logger.error("First 10 bytes: %s", index_buffer[0:10])
                 return pandas.DataFrame()
-        except OSError as h:
-            logger.error("Error decoding {0}: {1}".format(file_name, h))
-            logger.error("First 10 bytes: {0}".format(index_buffer[0:10]))
+        except (OSError, EOFError) as h:
+            logger.error("Error decoding %s: %s", name, h)
+            logger.error("First 10 bytes: %s", index_buffer[0:10])
             return pandas.DataFrame()
 
     # Get header line and data line starts
@@ -181,7 +215,7 @@ def parse_index_file(file_name: str, double_gz: bool = False):
 
     # Deal with broken field names
     if "Form" in data_table.columns and "Form Type" not in data_table.columns:
-        logger.warning("Index file has abnormal columns: {0}".format(file_name))
+        logger.warning("Index file has abnormal columns: %s", name)
         data_table["Form Type"] = data_table["Form"]
         del data_table["Form"]
 
@@ -190,12 +224,17 @@ def parse_index_file(file_name: str, double_gz: bool = False):
     try:
         data_table = data_table.loc[:, good_columns]
     except KeyError:
-        logger.error("Unable to identify proper columns in {0}".format(file_name))
-        logger.error("Columns found: {0}".format(data_table.columns))
+        logger.error("Unable to identify proper columns in %s", name)
+        logger.error("Columns found: %s", data_table.columns)
+
+    # Form types and filing dates repeat across most rows, so store each distinct value once
+    for column in ("Form Type", "Date Filed"):
+        if column in data_table.columns:
+            data_table[column] = data_table[column].astype("category")
 
     # Log exit
-    logger.info("Completed parsing index file: {0}".format(file_name))
-    logger.info("Index data shape: {0}".format(data_table.shape))
+    logger.info("Completed parsing index file: %s", name)
+    logger.info("Index data shape: %s", data_table.shape)
 
     # Return
     return data_table
@@ -218,16 +257,14 @@ def extract_filing_header_field(buffer: Union[bytes, str], field: str):
     return buffer[p0:p1].strip()
 
 
-def parse_filing(buffer: Union[bytes, str], extract: bool = False):
+def parse_filing(buffer: Union[bytes, str], extract: bool = False, lazy: bool = False):
     """
     Parse a filing file by returning each document within
     :param buffer:
     :param extract: whether to extract raw text
+    :param lazy: whether documents is a generator parsing each document as it is consumed, rather than a list
     :return:
     """
-    # Start and end tags
-    start_tag = "<DOCUMENT>"
-    end_tag = "</DOCUMENT>"
     filing_data = {"documents": [],
                    "accession_number": None,
                    "form_type": None,
@@ -309,6 +346,22 @@ def parse_filing(buffer: Union[bytes, str], extract: bool = False):
             filing_data["state_incorporation"] = extract_filing_header_field(header, "STATE OF INCORPORATION")
             filing_data["state_location"] = extract_filing_header_field(header, "STATE")
 
+    # Parse by doc
+    documents = iter_filing_documents(buffer, extract=extract)
+    filing_data["documents"] = documents if lazy else list(documents)
+    return filing_data
+
+
+def iter_filing_documents(buffer: str, extract: bool = False):
+    """
+    Parse and yield each document in a decoded filing buffer, one at a time.
+    :param buffer: filing buffer
+    :param extract: whether to extract raw text
+    :return:
+    """
+    start_tag = "<DOCUMENT>"
+    end_tag = "</DOCUMENT>"
+
     # Parse and yield by doc
     p0 = buffer.find(start_tag)
     while p0 != -1:
@@ -319,11 +372,9 @@ def parse_filing(buffer: Union[bytes, str], extract: bool = False):
         document_data = parse_filing_document(document_buffer, extract=extract)
         document_data["start_pos"] = p0
         document_data["end_pos"] = (p1 + len(end_tag))
-        filing_data["documents"].append(document_data)
+        yield document_data
         p0 = buffer.find(start_tag, p1)
 
-    return filing_data
-
 
 def parse_filing_document(document_buffer: Union[bytes, str], extract: bool = False):
     """
@@ -380,11 +431,11 @@ def parse_filing_document(document_buffer: Union[bytes, str], extract: bool = Fa
     doc_content = doc_content.encode("utf-8")
     if is_uuencoded:
         doc_content = uudecode(doc_content)
-    doc_sha1 = hashlib.sha1(doc_content).hexdigest()
+    doc_sha1_digest = hashlib.sha1(doc_content, usedforsecurity=False).digest()
 
     # extract text from tika if requested
     if extract:
-        doc_content_text = extract_text(doc_content)
+        doc_content_text = extract_text(doc_content, content_type)
     else:
         doc_content_text = None
 
@@ -393,6 +444,7 @@ def parse_filing_document(document_buffer: Union[bytes, str], extract: bool = Fa
             "file_name": doc_file_name[0] if len(doc_file_name) > 0 else None,
             "description": doc_description[0] if len(doc_description) > 0 else None,
             "content_type": content_type,
-            "sha1": doc_sha1,
+            "sha1": doc_sha1_digest.hex(),
+            "sha1_digest": doc_sha1_digest,
             "content": doc_content,
             "content_text": doc_content_text}
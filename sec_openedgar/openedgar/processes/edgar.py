@@ -27,13 +27,14 @@ from typing import Iterable
 import logging
 import os
 # Project
-import openedgar.clients.edgar
+import openedgar.clients.openedgar
 from openedgar.clients.s3 import S3Client
 from openedgar.clients.local import LocalClient
 import openedgar.clients.local
-import openedgar.parsers.edgar
-from openedgar.models import FilingDocument, SearchQueryTerm, SearchQuery, FilingIndex
-from openedgar.tasks import process_filing_index, search_filing_document_sha1
+import openedgar.parsers.openedgar
+from openedgar.models import CompanyInfo, Filing, FilingDocument, FilingIndex, FormType, SearchQuery, \
+    SearchQueryResult, SearchQueryTerm
+from openedgar.tasks import check_chord_backend, process_filing_index, search_filing_document_sha1
 
 # Logging setup
 logger = logging.getLogger(__name__)
@@ -51,15 +52,15 @@ def download_filing_index_data(year: int = None):
     :param year:
     :return:
     """
-    # Get filing index list
+    # Get filing index list, as the quarterly index paths for the year or for every year
     if year is not None:
-        filing_index_list = openedgar.clients.edgar.list_index_by_year(year)
+        filing_index_list = openedgar.clients.openedgar.get_index_paths(year, year)
     else:
-        filing_index_list = openedgar.clients.edgar.list_index()
+        filing_index_list = openedgar.clients.openedgar.get_index_paths()
 
     path_list = []
     configured_client = os.environ["CLIENT_TYPE"]
-    logger.info(msg="Configured client is: {}".format(configured_client))
+    logger.info("Configured client is: %s", configured_client)
     path_prefix = str()
 
     if configured_client is None or configured_client == "S3":
@@ -69,7 +70,13 @@ def download_filing_index_data(year: int = None):
         download_client = LocalClient()
         path_prefix = os.environ["DOWNLOAD_PATH"]
 
+    # Look up existing index records in one query
+    db_processed_map = dict(FilingIndex.objects.filter(edgar_url__in=filing_index_list)
+                            .values_list("edgar_url", "is_processed"))
+
     # Now iterate through list to check if already on S3
+    download_list = []
+    is_processed_map = {}
     for filing_index_path in filing_index_list:
         # Cleanup path
         if filing_index_path.startswith("/Archives/"):
@@ -78,35 +85,36 @@ def download_filing_index_data(year: int = None):
             file_path = os.path.join(path_prefix, filing_index_path)
 
         # Check if exists in database
-        try:
-            filing_index = FilingIndex.objects.get(edgar_url=filing_index_path)
-            is_processed = filing_index.is_processed
-            logger.info("Index {0} already exists in DB.".format(filing_index_path))
-        except FilingIndex.DoesNotExist:
+        if filing_index_path in db_processed_map:
+            is_processed = db_processed_map[filing_index_path]
+            logger.info("Index %s already exists in DB.", filing_index_path)
+        else:
             is_processed = False
-            logger.info("Index {0} does not exist in DB.".format(filing_index_path))
+            logger.info("Index %s does not exist in DB.", filing_index_path)
 
-        # Check if exists; download and upload to S3 if missing
+        # Queue for download if missing
         if not download_client.path_exists(file_path):
-            # Download
-            buffer, _ = openedgar.clients.edgar.get_buffer(filing_index_path)
-
-            # Upload
-            download_client.put_buffer(file_path, buffer)
-
-            logger.info("Retrieved {0} and uploaded to S3.".format(filing_index_path))
-            path_list.append((file_path, True, is_processed))
+            download_list.append((filing_index_path, file_path))
+            is_processed_map[file_path] = is_processed
         else:
-            logger.info("Index {0} already exists on S3.".format(filing_index_path))
+            logger.info("Index %s already exists on S3.", filing_index_path)
             path_list.append((file_path, False, is_processed))
 
+    # Download missing indexes, uploading each while the next is retrieved
+    for filing_index_path, file_path, success in openedgar.clients.openedgar.store_buffers(download_list,
+                                                                                           download_client):
+        if success:
+            logger.info("Retrieved %s and uploaded to S3.", filing_index_path)
+            path_list.append((file_path, True, is_processed_map[file_path]))
+
     # Return list of updates
     return path_list
 
 
 def process_all_filing_index(year: int = None, form_type_list: Iterable[str] = None, new_only: bool = False,
                              store_raw: bool = True,
-                             store_text: bool = True):
+                             store_text: bool = True,
+                             parallel: bool = False):
     """
     Process all filing index data.
     :type year: optional year to process
@@ -114,8 +122,14 @@ def process_all_filing_index(year: int = None, form_type_list: Iterable[str] = N
     :param new_only:
     :param store_raw:
     :param store_text:
+    :param parallel: whether each index task dispatches its filings as a Celery chord; needs a result backend that
+    supports chords
     :return:
     """
+    # Fail before downloading anything if parallel index tasks could never record their results
+    if parallel:
+        check_chord_backend()
+
     # Get the list of file paths
     file_path_list = download_filing_index_data(year)
 
@@ -125,15 +139,15 @@ def process_all_filing_index(year: int = None, form_type_list: Iterable[str] = N
     for s3_path, _, is_processed in file_path_list:
         # Skip if only processing new files and this one is old
         if new_only and not is_processed:
-            logger.info("Processing filing index for {0}...".format(s3_path))
+            logger.info("Processing filing index for %s...", s3_path)
             _ = process_filing_index.delay(client_type, s3_path, form_type_list=form_type_list, store_raw=store_raw,
-                                           store_text=store_text)
+                                           store_text=store_text, parallel=parallel)
         elif not new_only:
-            logger.info("Processing filing index for {0}...".format(s3_path))
+            logger.info("Processing filing index for %s...", s3_path)
             _ = process_filing_index.delay(client_type, s3_path, form_type_list=form_type_list, store_raw=store_raw,
-                                           store_text=store_text)
+                                           store_text=store_text, parallel=parallel)
         else:
-            logger.info("Skipping process_filing_index for {0}...".format(s3_path))
+            logger.info("Skipping process_filing_index for %s...", s3_path)
 
 
 def search_filing_documents(term_list: Iterable[str], form_type_list: Iterable[str] = None, sequence: int = None,
@@ -155,31 +169,26 @@ def search_filing_documents(term_list: Iterable[str], form_type_list: Iterable[s
     search_query.form_type = ";".join(form_type_list)
     search_query.save()
 
-    # Create terms
-    # search_term_list = []
-    for term in term_list:
-        search_term = SearchQueryTerm()
-        search_term.search_query = search_query
-        search_term.term = term
-        search_term.save()
-    # SearchQueryTerm.objects.bulk_create(search_term_list)
+    # Create terms in one insert
+    term_list = list(dict.fromkeys(term_list))
+    SearchQueryTerm.objects.bulk_create([SearchQueryTerm(search_query=search_query, term=term) for term in term_list])
 
     # Get doc list to search
     document_list = FilingDocument.objects
     if form_type_list is not None:
-        document_list = document_list.filter(filing__form_type__in=form_type_list)
+        document_list = document_list.filter(filing__form_type__name__in=form_type_list)
     if sequence is not None:
         document_list = document_list.filter(sequence=sequence)
 
     # Create distributed search tasks
     n = 0
-    for document in document_list.all():
-        search_filing_document_sha1.delay(document.sha1, term_list, search_query.id, document.id,
+    for document_sha1, document_id in document_list.values_list("sha1", "id").iterator():
+        search_filing_document_sha1.delay(bytes(document_sha1).hex(), term_list, search_query.id, document_id,
                                           case_sensitive=case_sensitive, token_search=token_search,
                                           stem_search=stem_search)
         n += 1
 
-    logger.info("Searching {0} documents for {1} terms...".format(n, len(term_list)))
+    logger.info("Searching %s documents for %s terms...", n, len(term_list))
 
 
 def export_filing_document_search(search_query_id: int, output_file_path: str):
@@ -191,18 +200,32 @@ def export_filing_document_search(search_query_id: int, output_file_path: str):
     """
     # Local imports
     import django.db
-    import pandas
-
-    # Create query string
-    query_string = """SELECT f.accession_number, f.date_filed, f.company_id, ci.name, ci.sic, ci.state_location, 
-f.form_type, fd.sequence, fd.description, fd.sha1, sqt.term, sqr.count
-FROM sec_edgar_searchqueryresult sqr
-JOIN sec_edgar_searchqueryterm sqt ON sqt.id = sqr.term_id
-JOIN sec_edgar_filingdocument fd ON fd.id = sqr.filing_document_id
-JOIN sec_edgar_filing f ON f.id = fd.filing_id
-JOIN sec_edgar_companyinfo ci ON ci.company_id = f.company_id AND ci.date = f.date_filed 
-WHERE sqr.search_query_id = {0}
+
+    # Create query string, taking table names from the models so they track the migrations; company info is
+    # refreshed over time, so take the latest record as of each filing date
+    query_string = """SELECT regexp_replace(lpad(f.accession_number::text, 18, '0'),
+                      '^(.{{10}})(.{{2}})(.{{6}})$', '\\1-\\2-\\3') AS accession_number,
+f.date_filed, f.company_id, ci.name, ci.sic, ci.business_state AS state_location,
+ft.name AS form_type, fd.sequence, fd.description, encode(fd.sha1, 'hex') AS sha1, sqt.term, sqr.count
+FROM {search_query_result} sqr
+JOIN {search_query_term} sqt ON sqt.id = sqr.term_id
+JOIN {filing_document} fd ON fd.id = sqr.filing_document_id
+JOIN {filing} f ON f.id = fd.filing_id
+LEFT JOIN {form_type} ft ON ft.id = f.form_type_id
+LEFT JOIN LATERAL (SELECT name, sic, business_state FROM {company_info}
+                   WHERE cik = f.company_id AND asof <= f.date_filed
+                   ORDER BY asof DESC LIMIT 1) ci ON TRUE
+WHERE sqr.search_query_id = {search_query_id}
 ORDER BY f.date_filed, f.company_id
-""".format(search_query_id)
-    query_df = pandas.read_sql(query_string, django.db.connection)
-    query_df.to_csv(output_file_path, encoding="utf-8", index=False)
+""".format(search_query_result=SearchQueryResult._meta.db_table,
+           search_query_term=SearchQueryTerm._meta.db_table,
+           filing_document=FilingDocument._meta.db_table,
+           filing=Filing._meta.db_table,
+           form_type=FormType._meta.db_table,
+           company_info=CompanyInfo._meta.db_table,
+           search_query_id=int(search_query_id))
+
+    # Stream rows from the server straight to disk rather than materializing them in a DataFrame
+    with open(output_file_path, "w", encoding="utf-8", newline="") as output_file, \
+            django.db.connection.cursor() as cursor:
+        cursor.copy_expert("COPY ({0}) TO STDOUT WITH (FORMAT csv, HEADER)".format(query_string.strip()), output_file)
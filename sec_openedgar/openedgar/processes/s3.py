@@ -130,7 +130,7 @@ def clean_rate_limited_files(cik: int = None, fix: bool = True, client=None):
         # Otherwise populate list with single CIK
         cik_path_list = [openedgar.clients.edgar.get_cik_path(cik)]
 
-    logger.info("Checking {0} CIKs for bad rate-limited files...".format(len(cik_path_list)))
+    logger.info("Checking %s CIKs for bad rate-limited files...", len(cik_path_list))
 
     for cik_path in cik_path_list:
         for remote_path in openedgar.clients.s3.list_path(cik_path, client=client):
@@ -139,12 +139,12 @@ def clean_rate_limited_files(cik: int = None, fix: bool = True, client=None):
 
             # Track if bad
             if is_bad:
-                logger.info("Found bad file: {0}".format(remote_path))
+                logger.info("Found bad file: %s", remote_path)
                 file_list.append(remote_path)
 
                 # Fix if requested
                 if fix:
-                    logger.info("Fixing file: {0}".format(remote_path))
+                    logger.info("Fixing file: %s", remote_path)
 
                     # Ensure path is correct
                     if not remote_path.strip("/").startswith("Archives/"):
@@ -159,9 +159,9 @@ def clean_rate_limited_files(cik: int = None, fix: bool = True, client=None):
                     openedgar.clients.s3.put_buffer(remote_path, buffer, client)
 
                     # Log fix
-                    logger.info("Replaced {0} with new {1}-byte file...".format(remote_path, len(buffer)))
+                    logger.info("Replaced %s with new %s-byte file...", remote_path, len(buffer))
 
-    logger.info("Located {0} bad files...".format(len(file_list)))
+    logger.info("Located %s bad files...", len(file_list))
     return file_list
 
 
@@ -189,7 +189,7 @@ def clean_empty_files(cik: int = None, fix: bool = True, client=None):
         # Otherwise populate list with single CIK
         cik_path_list = [openedgar.clients.edgar.get_cik_path(cik)]
 
-    logger.info("Checking {0} CIKs for bad zero-byte files...".format(len(cik_path_list)))
+    logger.info("Checking %s CIKs for bad zero-byte files...", len(cik_path_list))
 
     for cik_path in cik_path_list:
         for remote_path in openedgar.clients.s3.list_path(cik_path, client=client):
@@ -198,12 +198,12 @@ def clean_empty_files(cik: int = None, fix: bool = True, client=None):
 
             # Track if bad
             if is_bad:
-                logger.info("Found bad file: {0}".format(remote_path))
+                logger.info("Found bad file: %s", remote_path)
                 file_list.append(remote_path)
 
                 # Fix if requested
                 if fix:
-                    logger.info("Fixing file: {0}".format(remote_path))
+                    logger.info("Fixing file: %s", remote_path)
 
                     # Ensure path is correct
                     if not remote_path.strip("/").startswith("Archives/"):
@@ -219,12 +219,12 @@ def clean_empty_files(cik: int = None, fix: bool = True, client=None):
                         openedgar.clients.s3.put_buffer(remote_path, buffer, client)
 
                         # Log fix
-                        logger.info("Replaced {0} with new {1}-byte file...".format(remote_path, len(buffer)))
+                        logger.info("Replaced %s with new %s-byte file...", remote_path, len(buffer))
                     else:
                         # Log error
-                        logger.error("Unable to locate non-zero length replacement for {0}".format(remote_path))
+                        logger.error("Unable to locate non-zero length replacement for %s", remote_path)
 
-    logger.info("Located {0} bad files...".format(len(file_list)))
+    logger.info("Located %s bad files...", len(file_list))
     return file_list
 
 
@@ -252,7 +252,7 @@ def clean_access_denied_files(cik: int = None, fix: bool = True, client=None):
         # Otherwise populate list with single CIK
         cik_path_list = [openedgar.clients.edgar.get_cik_path(cik)]
 
-    logger.info("Checking {0} CIKs for bad access denied files...".format(len(cik_path_list)))
+    logger.info("Checking %s CIKs for bad access denied files...", len(cik_path_list))
 
     for cik_path in cik_path_list:
         for remote_path in openedgar.clients.s3.list_path(cik_path, client=client):
@@ -261,23 +261,23 @@ def clean_access_denied_files(cik: int = None, fix: bool = True, client=None):
 
             # Track if bad
             if is_bad:
-                logger.info("Found bad file: {0}".format(remote_path))
+                logger.info("Found bad file: %s", remote_path)
                 file_list.append(remote_path)
 
                 # Fix if requested
                 if fix:
-                    logger.info("Removing file: {0}".format(remote_path))
+                    logger.info("Removing file: %s", remote_path)
 
                     # Replace bad remote path on S3
                     success = openedgar.clients.s3.delete_path(remote_path, client)
 
                     # Log fix
                     if success:
-                        logger.info("Deleted {0}...".format(remote_path))
+                        logger.info("Deleted %s...", remote_path)
                     else:
-                        logger.error("Unable to delete {0}...".format(remote_path))
+                        logger.error("Unable to delete %s...", remote_path)
             else:
-                logger.info("No issues found with {0}".format(remote_path))
+                logger.info("No issues found with %s", remote_path)
 
-    logger.info("Located {0} bad files...".format(len(file_list)))
+    logger.info("Located %s bad files...", len(file_list))
     return file_list
@@ -25,34 +25,57 @@ SOFTWARE.
 # Libraries
 import sys
 import traceback
+import concurrent.futures
 import datetime
+import functools
 import hashlib
+import itertools
 import logging
-import tempfile
+import threading
+import time
 import os
 import pathlib
+import queue
+import re
+from collections import Counter, OrderedDict
 from typing import Iterable, Union
 
 # Packages
+import celery
+import celery.backends.base
+import celery.backends.rpc
+import django.db
+import django.db.models
+import django.db.transaction
+import django.utils.timezone
 import dateutil.parser
-import django.db.utils
+import psycopg2.extras
 from celery import shared_task
 
+# Optional single-pass multi-term matching for searches, preferring hyperscan
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 # Project
-from config.settings.base import S3_DOCUMENT_PATH
+from config.settings.base import BULK_CREATE_BATCH_SIZE, BULK_INSERT_USE_COPY, HTTP_MAX_WORKERS, \
+    HTTP_PIPELINE_QUEUE_SIZE, S3_DOCUMENT_PATH, S3_MAX_WORKERS
 from openedgar.clients.s3 import S3Client
 from openedgar.clients.local import LocalClient
 import openedgar.clients.openedgar
 import openedgar.parsers.openedgar
-from openedgar.models import Filing, CompanyInfo, Company, FilingDocument, SearchQuery, SearchQueryTerm, \
-    SearchQueryResult, FilingIndex
+from openedgar.models import Filing, CompanyInfo, Company, FilingDocument, SearchQueryTerm, \
+    SearchQueryResult, FilingIndex, FormType, SIC, FilingState
     
 # edgartools
 import edgar
 
-# LexNLP imports
-import lexnlp.nlp.en.tokens
-
 # Logging setup
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -62,228 +85,578 @@ formatter = logging.Formatter('%(name)-12s: %(levelname)-8s %(message)s')
 console.setFormatter(formatter)
 logger.addHandler(console)
 
+# Shared pool for storage round-trips, reused across tasks to avoid per-filing thread startup
+_UPLOAD_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=S3_MAX_WORKERS)
+
+# Documents are uploaded in batches of this many objects as they are parsed, enough to keep the pool busy
+DOCUMENT_UPLOAD_BATCH_SIZE = 2 * S3_MAX_WORKERS
+
+# Storage prefixes for document contents, named by sha1; built once rather than per document
+RAW_DOCUMENT_PREFIX = pathlib.Path(S3_DOCUMENT_PATH, "raw").as_posix() + "/"
+TEXT_DOCUMENT_PREFIX = pathlib.Path(S3_DOCUMENT_PATH, "text").as_posix() + "/"
+
+# FilingDocument rows per INSERT statement
+FILING_DOCUMENT_BATCH_SIZE = BULK_CREATE_BATCH_SIZE
+
+# FilingDocument conflict key and the fields refreshed when a filing's documents are stored again
+FILING_DOCUMENT_UNIQUE_FIELDS = ("filing", "sequence")
+FILING_DOCUMENT_UPDATE_FIELDS = ("type", "file_name", "content_type", "description", "sha1", "start_pos", "end_pos",
+                                 "is_processed", "is_error")
+
+# Filing hashes run alongside parsing on this pool
+_HASH_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count())
+
+# Per-process Company cache for process_filing, reset when it reaches this size
+COMPANY_CACHE_SIZE = 10000
+_COMPANY_CACHE = {}
+
+# Case-insensitive searches lower-case documents in chunks of this many characters
+SEARCH_CHUNK_SIZE = 1 << 20
+
+# Compiled hyperscan databases per thread, since each carries its own scratch space
+SEARCH_DATABASE_CACHE_SIZE = 64
+_SEARCH_LOCAL = threading.local()
+
+# Address attributes stored in CompanyInfo JSON columns
+ADDRESS_FIELDS = ("street1", "street2", "city", "state_or_country", "state_or_country_desc", "zipcode")
+
+# Term lists kept stemmed and case-folded across the documents searched for a query
+SEARCH_TERM_CACHE_SIZE = 256
+
+# Recently searched document contents, kept for at most DOCUMENT_CACHE_TTL seconds
+DOCUMENT_CACHE_SIZE = 64
+DOCUMENT_CACHE_TTL = 600
+_DOCUMENT_CACHE = OrderedDict()
+_DOCUMENT_LOCK = threading.Lock()
+
+# Error filings collected in process_filing_index are flushed in batches of this size
+FILING_ERROR_BATCH_SIZE = BULK_CREATE_BATCH_SIZE
+
+# Index paths checked per Filing lookup query
+FILING_PATH_LOOKUP_BATCH_SIZE = 10000
+
+# Company info lookups queued per Celery group when refreshing in parallel
+COMPANYINFO_DISPATCH_SIZE = 1000
+
+
 def process_cik_lookup_data():
     """
     populate company table
     """
     try:
         df = edgar.get_cik_lookup_data()
-        ciknames = {}
-        company_objects = []
-        for row in df.itertuples():
-            ciknames[row.cik] = row.name
-        for cik in ciknames.keys():
-            company_objects.append(
-                Company(cik=cik, cik_name=ciknames[cik]))
-        Company.objects.bulk_create(
-            company_objects,
-            update_conflicts=True, 
-            update_fields=['cik_name'],
-            unique_fields=['cik'])
+        # Keep the last name per CIK; an upsert cannot touch the same row twice in one statement
+        df = df.drop_duplicates(subset="cik", keep="last")
+        # Upsert plain tuples rather than building a model instance per CIK
+        with django.db.transaction.atomic(), django.db.connection.cursor() as cursor:
+            psycopg2.extras.execute_values(
+                cursor,
+                'INSERT INTO "{0}" (cik, cik_name) VALUES %s '
+                'ON CONFLICT (cik) DO UPDATE SET cik_name = EXCLUDED.cik_name'
+                .format(Company._meta.db_table),
+                zip(df["cik"].tolist(), df["name"].tolist()),
+                page_size=BULK_CREATE_BATCH_SIZE)
     except Exception:
         error = sys.exc_info()[0]
         details = traceback.format_exc()
         sys.stderr.write(f'{error} - {details}')
-        
-def process_companyinfo(cik=0, multiple=False):
+
+
+def get_address_fields(address):
+    """
+    Get the stored fields of an edgartools address as a dict for a JSON column.
+    :param address: edgartools Address or None
+    :return:
+    """
+    if address is None:
+        return None
+    return {field: getattr(address, field, None) for field in ADDRESS_FIELDS}
+
+
+@shared_task
+def process_companyinfo_cik(cik: int):
+    """
+    Fetch the current EDGAR company profile for a single CIK and upsert today's CompanyInfo record.
+    :param cik: company CIK
+    :return:
+    """
     try:
-        if cik == 0 or multiple:
-            companies = Company.objects.all().filter(cik__gte=cik).order_by('cik')
-        else:
-            companies = [Company.objects.get(cik=cik)]
-        for company in companies:
-            c = edgar.Company(company.cik)
-            cik = company.cik
-            ci = CompanyInfo()
-            ci.cik = company
-            ci.name = c.name
-            ci.is_company = c.is_company
-            ci.category = c.category
-            ci.description = c.description
-            ci.entity_type = c.entity_type
-            ci.ein = c.ein
-            ci.industry = c.industry
-            ci.sic = c.sic
-            ci.sic_description = c.sic_description
-            ci.state_of_incorporation = c.state_of_incorporation
-            ci.state_of_incorporation_description = c.state_of_incorporation_description
-            ci.fiscal_year_end = c.fiscal_year_end
-            ci.mailing_address = c.mailing_address.__dict__
-            ci.business_addres = c.business_address.__dict__
-            ci.phone = c.phone
-            ci.tickers = c.tickers
-            ci.exchanges = c.exchanges
-            ci.former_names = c.former_names
-            ci.flags = c.flags
-            ci.insider_transaction_for_owner_exists = c.insider_transaction_for_owner_exists
-            ci.insider_transaction_for_issuer_exists = c.insider_transaction_for_issuer_exists
-            ci.website = c.website
-            ci.investor_website = c.investor_website
-            try:
-                oci = CompanyInfo.objects.get(cik=c.cik)
-                if ci != oci:
-                    ci.name = oci.name
-                    ci.is_company = oci.is_company
-                    ci.category = oci.category
-                    ci.description = oci.description
-                    ci.entity_type = oci.entity_type
-                    ci.ein = oci.ein
-                    ci.industry = oci.industry
-                    ci.sic = oci.sic
-                    ci.sic_description = oci.sic_description
-                    ci.state_of_incorporation = oci.state_of_incorporation
-                    ci.state_of_incorporation_description = oci.state_of_incorporation_description
-                    ci.fiscal_year_end = oci.fiscal_year_end
-                    ci.mailing_address = oci.mailing_address.__dict__
-                    ci.business_addres = oci.business_address.__dict__
-                    ci.phone = oci.phone
-                    ci.tickers = oci.tickers
-                    ci.exchanges = oci.exchanges
-                    ci.former_names = oci.former_names
-                    ci.flags = oci.flags
-                    ci.insider_transaction_for_owner_exists = oci.insider_transaction_for_owner_exists
-                    ci.insider_transaction_for_issuer_exists = oci.insider_transaction_for_issuer_exists
-                    ci.website = oci.website
-                    ci.investor_website = oci.investor_website
-            except CompanyInfo.DoesNotExist:
-                pass
-            ci.save()
+        c = edgar.Company(cik)
+        ci = CompanyInfo()
+        ci.cik_id = cik
+        ci.name = c.name
+        ci.is_company = c.is_company
+        ci.category = c.category
+        ci.description = c.description
+        ci.entity_type = c.entity_type
+        ci.ein = c.ein
+        ci.industry = c.industry
+        ci.sic_id = SIC.get_code(c.sic, c.sic_description)
+        ci.state_of_incorporation = c.state_of_incorporation
+        ci.state_of_incorporation_description = c.state_of_incorporation_description
+        ci.fiscal_year_end = c.fiscal_year_end
+        ci.mailing_address = get_address_fields(c.mailing_address)
+        ci.business_address = get_address_fields(c.business_address)
+        if c.business_address is not None:
+            ci.business_city = c.business_address.city
+            ci.business_state = c.business_address.state_or_country
+            ci.business_zip = c.business_address.zipcode
+        ci.phone = c.phone
+        ci.tickers = c.tickers
+        ci.exchanges = c.exchanges
+        ci.former_names = c.former_names
+        ci.flags = c.flags
+        ci.insider_transaction_for_owner_exists = c.insider_transaction_for_owner_exists
+        ci.insider_transaction_for_issuer_exists = c.insider_transaction_for_issuer_exists
+        ci.website = c.website
+        ci.investor_website = c.investor_website
+        # Keep one row per CIK per day, refreshing today's row if it was already fetched
+        update_fields = [field.name for field in CompanyInfo._meta.concrete_fields
+                         if field.name not in ("id", "cik", "asof")]
+        CompanyInfo.objects.bulk_create([ci], update_conflicts=True, unique_fields=["cik", "asof"],
+                                        update_fields=update_fields)
+        return True
     except Exception:
         error = sys.exc_info()[0]
         details = traceback.format_exc()
         sys.stderr.write(f'{cik}: {error} - {details}')
-                
-def create_filing_documents(client, documents, filing, store_raw: bool = True, store_text: bool = True):
+        return False
+
+
+def process_companyinfo(cik=0, multiple=False, parallel: bool = False, missing_only: bool = False):
     """
-    Create filing document records given a list of documents
+    Refresh CompanyInfo for one company, or for every company from a starting CIK onward.
+    :param cik: single CIK, or starting CIK when multiple; 0 processes all companies
+    :param multiple: process all companies with CIK >= cik
+    :param parallel: fan the per-company lookups out to Celery workers
+    :param missing_only: skip companies already refreshed today, e.g., to resume an interrupted run
+    :return:
+    """
+    if cik == 0 or multiple:
+        companies = Company.objects.filter(cik__gte=cik).order_by('cik')
+    else:
+        companies = Company.objects.filter(cik=cik)
+
+    # Let the database exclude refreshed companies rather than comparing CIK sets in Python
+    if missing_only:
+        companies = companies.exclude(
+            django.db.models.Exists(CompanyInfo.objects.filter(cik=django.db.models.OuterRef("cik"),
+                                                               asof=django.utils.timezone.localdate())))
+    ciks = companies.values_list("cik", flat=True).iterator(chunk_size=COMPANYINFO_DISPATCH_SIZE)
+
+    if not parallel:
+        for company_cik in ciks:
+            process_companyinfo_cik(company_cik)
+        return
+
+    # Dispatch in bounded windows so neither the broker nor this process holds the full company list at once
+    while True:
+        cik_window = list(itertools.islice(ciks, COMPANYINFO_DISPATCH_SIZE))
+        if len(cik_window) == 0:
+            break
+        jobs = celery.group(process_companyinfo_cik.s(company_cik) for company_cik in cik_window)
+        results = jobs.apply_async().join(disable_sync_subtasks=False)
+        logger.info("Refreshed company info for %d of %d companies", sum(bool(r) for r in results),
+                    len(results))
+
+
+def create_filing_documents(client, documents, filing, store_raw: bool = True, store_text: bool = True,
+                            mark_processed: bool = False):
+    """
+    Create filing document records given an iterable of documents
     and a filing record.
-    :param documents: list of documents from parse_filing
+    :param documents: documents from parse_filing, consumed incrementally if a generator
     :param filing: Filing record
     :param store_raw: whether to store raw contents
     :param store_text: whether to store text contents
+    :param mark_processed: also mark the filing processed, in the same transaction as its document records
     :return:
     """
-    # Get client if we're using S3
-
-
-    # Iterate through documents
+    # Iterate through documents, collecting uploads keyed by path so duplicate exhibits are stored once
     document_records = []
+    upload_jobs = {}
     for document in documents:
-        # Create DB object
-        filing_doc = FilingDocument()
-        filing_doc.filing = filing
-        filing_doc.type = document["type"]
-        filing_doc.sequence = document["sequence"]
-        filing_doc.file_name = document["file_name"]
-        filing_doc.content_type = document["content_type"]
-        filing_doc.description = document["description"]
-        filing_doc.sha1 = document["sha1"]
-        filing_doc.start_pos = document["start_pos"]
-        filing_doc.end_pos = document["end_pos"]
-        filing_doc.is_processed = True
-        filing_doc.is_error = len(document["content"]) > 0
-        document_records.append(filing_doc)
+        # Create DB row
+        document_records.append({"filing": filing,
+                                 "type_id": FormType.get_id(document["type"]),
+                                 "sequence": document["sequence"],
+                                 "file_name": document["file_name"],
+                                 "content_type": document["content_type"],
+                                 "description": document["description"],
+                                 "sha1": document["sha1_digest"],
+                                 "start_pos": document["start_pos"],
+                                 "end_pos": document["end_pos"],
+                                 "is_processed": True,
+                                 "is_error": len(document["content"]) > 0})
 
         # Upload raw if requested
         if store_raw and len(document["content"]) > 0:
-            raw_path = pathlib.Path(S3_DOCUMENT_PATH, "raw", document["sha1"]).as_posix()
-            if not client.path_exists(raw_path):
-                client.put_buffer(raw_path, document["content"])
-                logger.info("Uploaded raw file for filing={0}, sequence={1}, sha1={2}"
-                            .format(filing, document["sequence"], document["sha1"]))
-            else:
-                logger.info("Raw file for filing={0}, sequence={1}, sha1={2} already exists on S3"
-                            .format(filing, document["sequence"], document["sha1"]))
+            raw_path = RAW_DOCUMENT_PREFIX + document["sha1"]
+            upload_jobs[raw_path] = (document, document["content"], {}, "raw file")
 
         # Upload text to S3 if requested
         if store_text and document["content_text"] is not None:
-            raw_path = pathlib.Path(S3_DOCUMENT_PATH, "text", document["sha1"]).as_posix()
-            if not client.path_exists(raw_path):
-                client.put_buffer(raw_path, document["content_text"], write_bytes=False)
-                logger.info("Uploaded text contents for filing={0}, sequence={1}, sha1={2}"
-                            .format(filing, document["sequence"], document["sha1"]))
-            else:
-                logger.info("Text contents for filing={0}, sequence={1}, sha1={2} already exists on S3"
-                            .format(filing, document["sequence"], document["sha1"]))
-
-    # Create in bulk
-    FilingDocument.objects.bulk_create(document_records)
+            text_path = TEXT_DOCUMENT_PREFIX + document["sha1"]
+            upload_jobs[text_path] = (document, document["content_text"], {"write_bytes": False}, "text contents")
+
+        # Upload a batch at a time so only its contents are held in memory
+        document.pop("content")
+        document.pop("content_text")
+        if len(upload_jobs) >= DOCUMENT_UPLOAD_BATCH_SIZE:
+            store_filing_documents(client, upload_jobs, filing)
+            upload_jobs.clear()
+
+    store_filing_documents(client, upload_jobs, filing)
+
+    # Create in bulk once every upload has succeeded, keeping the first document for a repeated sequence
+    # and refreshing records left by an earlier attempt
+    unique_records = {}
+    for record in document_records:
+        unique_records.setdefault(record["sequence"], record)
+    document_records = list(unique_records.values())
+    with django.db.transaction.atomic():
+        if BULK_INSERT_USE_COPY:
+            FilingDocument.bulk_copy_insert(document_records, unique_fields=FILING_DOCUMENT_UNIQUE_FIELDS,
+                                            update_fields=FILING_DOCUMENT_UPDATE_FIELDS)
+        else:
+            FilingDocument.bulk_upsert(document_records, unique_fields=FILING_DOCUMENT_UNIQUE_FIELDS,
+                                       update_fields=FILING_DOCUMENT_UPDATE_FIELDS,
+                                       batch_size=FILING_DOCUMENT_BATCH_SIZE)
+
+        # Only the state changes, so update that column alone
+        if mark_processed:
+            filing.state = FilingState.PROCESSED
+            filing.save(update_fields=["state"])
     return len(document_records)
 
 
-def create_filing_error(row, filing_path: str):
+def store_filing_documents(client, upload_jobs: dict, filing):
     """
-    Create a Filing error record from an index row.
-    :param row:
-    :param filing_path:
+    Upload a batch of document contents that are not already stored; see create_filing_documents.
+    :param upload_jobs: dict of path to (document, payload, put_buffer kwargs, label)
+    :param filing: Filing record
     :return:
     """
-    # Get vars
-    cik = row["CIK"]
-    company_name = row["Company Name"]
-    form_type = row["Form Type"]
+    # Each path checks and uploads as one job, so uploads start without waiting on the rest of the batch's round-trips
+    upload_futures = []
+    for path, (document, payload, put_kwargs, label) in upload_jobs.items():
+        future = _UPLOAD_EXECUTOR.submit(put_buffer_if_missing, client, path, payload, put_kwargs)
+        upload_futures.append((future, document, label))
+
+    # Any failed upload aborts the filing before its document records are created
+    for future, document, label in upload_futures:
+        if not future.result():
+            logger.info("%s for filing=%s, sequence=%s, sha1=%s already exists on S3",
+                        label.capitalize(), filing, document["sequence"], document["sha1"])
+            continue
+
+        logger.info("Uploaded %s for filing=%s, sequence=%s, sha1=%s",
+                    label, filing, document["sequence"], document["sha1"])
 
+
+def put_buffer_if_missing(client, path: str, payload, put_kwargs: dict):
+    """
+    Upload a payload unless the path is already stored.
+    :param client: storage client
+    :param path: storage path
+    :param payload: buffer to upload
+    :param put_kwargs: keyword arguments for client.put_buffer
+    :return: whether the payload was uploaded
+    """
+    if client.path_exists(path):
+        return False
+    client.put_buffer(path, payload, **put_kwargs)
+    return True
+
+
+def create_filing_error(cik, company_name: str, form_type: str, date_filed, filing_path: str):
+    """
+    Build unsaved Company and error Filing records from index row fields; see flush_filing_errors.
+    :param cik:
+    :param company_name:
+    :param form_type:
+    :param date_filed: index Date Filed value, parsed here
+    :param filing_path:
+    :return: tuple of (company, filing)
+    """
     try:
-        date_filed = dateutil.parser.parse(str(row["Date Filed"])).date()
+        date_filed = dateutil.parser.parse(str(date_filed)).date()
     except ValueError:
         date_filed = None
     except IndexError:
         date_filed = None
 
+    # Company is inserted if missing when flushed
+    company = Company(cik=cik, cik_name=company_name)
+
     # Create empty error filing record
     filing = Filing()
-    filing.form_type = form_type
+    filing.form_type_id = FormType.get_id(form_type)
     filing.date_filed = date_filed
     filing.s3_path = filing_path
-    filing.is_error = True
-    filing.is_processed = False
+    filing.state = FilingState.ERROR
+    filing.company_id = cik
+    return company, filing
+
+
+def flush_filing_errors(companies: dict, filings: list, batch_size: int = FILING_ERROR_BATCH_SIZE):
+    """
+    Insert companies and error filings collected from create_filing_error, then clear them.
+    :param companies: dict of cik to unsaved Company
+    :param filings: list of unsaved Filing
+    :param batch_size: number of rows per INSERT statement
+    :return:
+    """
+    if not filings:
+        return
+
+    # Companies first so filing foreign keys resolve; existing CIKs are left as-is
+    with django.db.transaction.atomic():
+        Company.objects.bulk_create(list(companies.values()), batch_size=batch_size, ignore_conflicts=True)
+        Filing.objects.bulk_create(filings, batch_size=batch_size, ignore_conflicts=True)
+    logger.info("Created %s error filing records.", len(filings))
+    companies.clear()
+    filings.clear()
+
+
+def warm_company_cache(ciks: Iterable[int]):
+    """
+    Load the companies for a set of CIKs into the process cache with a single query.
+    :param ciks: CIKs to load
+    :return:
+    """
+    ciks = [int(cik) for cik in ciks]
+    if len(_COMPANY_CACHE) + len(ciks) > COMPANY_CACHE_SIZE:
+        _COMPANY_CACHE.clear()
+    _COMPANY_CACHE.update(Company.objects.in_bulk(ciks, field_name="cik"))
+
+
+def get_company(cik: Union[int, str], cik_name: str = None):
+    """
+    Get a Company by CIK from the process cache, falling back to the database and creating it if missing.
+    :param cik: CIK as an int or zero-padded header string
+    :param cik_name: name used if the company is created
+    :return:
+    """
+    cik = int(cik)
+    company = _COMPANY_CACHE.get(cik)
+    if company is None:
+        company, _ = Company.objects.get_or_create(cik=cik, defaults={"cik_name": cik_name or ""})
+        if len(_COMPANY_CACHE) >= COMPANY_CACHE_SIZE:
+            _COMPANY_CACHE.clear()
+        _COMPANY_CACHE[cik] = company
+    return company
+
+
+def get_filing_paths(file_names):
+    """
+    Normalize index File Name values to storage paths under edgar/.
+    :param file_names: pandas Series of index file names
+    :return: Series of paths, None where the name is not under data/ or edgar/
+    """
+    # Only the leading directory decides the layout, so lowercase just that rather than every full path
+    name_prefixes = file_names.str[:len("edgar/")].str.lower()
+    filing_paths = file_names.where(name_prefixes.str.startswith("edgar/"))
+
+    # Prefix only the names that need it instead of building a prefixed copy of every row
+    data_mask = name_prefixes.str.startswith("data/").fillna(False).astype(bool)
+    if data_mask.any():
+        filing_paths[data_mask] = "edgar/" + file_names[data_mask]
+    return filing_paths
+
+
+def get_existing_filing_paths(filing_paths: list, batch_size: int = FILING_PATH_LOOKUP_BATCH_SIZE):
+    """
+    Get the subset of paths that already have Filing records.
+    :param filing_paths: list of distinct storage paths
+    :param batch_size: number of paths per IN query, keeping statements for quarterly indexes to a plannable size
+    :return: set of recorded paths
+    """
+    existing_paths = set()
+    for i in range(0, len(filing_paths), batch_size):
+        existing_paths.update(Filing.objects.filter(s3_path__in=filing_paths[i:i + batch_size])
+                              .values_list("s3_path", flat=True))
+    return existing_paths
+
 
-    # Get company info
+def fetch_filing(client, filing_path: str):
+    """
+    Get a filing buffer from storage, or from EDGAR if it is not stored yet.
+    :param client: storage client
+    :param filing_path: storage path of the filing, under edgar/
+    :return: tuple of (buffer, sha1 or None, whether the buffer still needs storing), or None if unavailable
+    """
+    # Read from storage directly rather than checking first, so a stored filing costs one request
+    filing_buffer = client.get_buffer_if_exists(filing_path)
+    if filing_buffer is not None:
+        logger.info("File already stored on %s, retrieving and processing...", type(client).__name__)
+        return filing_buffer, None, False
+
+    # Download if missing
     try:
-        company = Company.objects.get(cik=cik)
+        filing_buffer, _, filing_sha1 = openedgar.clients.openedgar.get_buffer(
+            "/Archives/{0}".format(filing_path), with_sha1=True)
+    except RuntimeError as g:
+        logger.error("Unable to access resource %s from EDGAR: %s", filing_path, g)
+        return None
+    return filing_buffer, filing_sha1, True
 
+
+def fetch_and_process_filing(client, filing_path: str, store_raw: bool = False, store_text: bool = False):
+    """
+    Store a filing from EDGAR if it is missing from storage, then process it.
+    :param client: storage client
+    :param filing_path: storage path of the filing, under edgar/
+    :param store_raw:
+    :param store_text:
+    :return: true if the filing was processed
+    """
+    # Download if missing
+    fetched = fetch_filing(client, filing_path)
+    if fetched is None:
+        return False
+    filing_buffer, filing_sha1, needs_store = fetched
+
+    # Upload
+    if needs_store:
+        client.put_buffer(filing_path, filing_buffer)
+        logger.info("Downloaded from EDGAR and uploaded to %s...", type(client).__name__)
+
+    # Parse
+    filing_result = process_filing(client, filing_path, filing_buffer, store_raw=store_raw, store_text=store_text,
+                                   filing_sha1=filing_sha1)
+    if filing_result is None:
+        logger.error("Unable to process filing.")
+        return False
+    return True
+
+
+def fetch_and_process_filings(client, filing_paths: Iterable[str], store_raw: bool = False, store_text: bool = False,
+                              queue_size: int = HTTP_PIPELINE_QUEUE_SIZE,
+                              fetch_workers: int = HTTP_MAX_WORKERS, check_existing: bool = True):
+    """
+    Store and process filings as a pipeline: several threads fetch the next filings, another uploads those
+    downloaded from EDGAR, and the calling thread parses and records each, so network and database work overlap.
+    :param client: storage client, shared by all stages
+    :param filing_paths: storage paths of the filings, under edgar/
+    :param store_raw:
+    :param store_text:
+    :param queue_size: maximum number of buffers waiting between stages
+    :param fetch_workers: number of concurrent fetches; the shared rate limiter still paces requests to EDGAR
+    :param check_existing: whether to check for an existing Filing record per filing; see process_filing
+    :return: generator of (filing_path, whether the filing was processed), in completion order
+    """
+    # Bounded queues cap memory at queue_size buffers per stage and apply backpressure upstream
+    fetch_queue = queue.Queue(maxsize=queue_size)
+    store_queue = queue.Queue(maxsize=queue_size)
+    stop_event = threading.Event()
+    stage_errors = []
+    filing_path_iter = iter(filing_paths)
+    filing_path_lock = threading.Lock()
+
+    def fetch():
         try:
-            _ = CompanyInfo.objects.get(company=company, date=date_filed)
-        except CompanyInfo.DoesNotExist:
-            # Create company info record
-            company_info = CompanyInfo()
-            company_info.company = company
-            company_info.name = company_name
-            company_info.sic = None
-            company_info.state_incorporation = None
-            company_info.state_location = None
-            company_info.date = date_filed
-            company_info.save()
-    except Company.DoesNotExist:
-        # Create company
-        company = Company()
-        company.cik = cik
-        company.cik_name = company_name
+            while not stop_event.is_set():
+                with filing_path_lock:
+                    filing_path = next(filing_path_iter, None)
+                if filing_path is None:
+                    break
 
+                try:
+                    fetched = fetch_filing(client, filing_path)
+                except Exception as e:  # pylint: disable=broad-except
+                    logger.error("Unable to retrieve filing %s: %s", filing_path, e)
+                    fetched = None
+                openedgar.clients.openedgar.put_unless_stopped(fetch_queue, (filing_path, fetched), stop_event)
+        except Exception as e:  # pylint: disable=broad-except
+            stage_errors.append(e)
+        finally:
+            openedgar.clients.openedgar.put_unless_stopped(fetch_queue, None, stop_event)
+
+    def store():
         try:
-            company.save()
-        except django.db.utils.IntegrityError:
-            return create_filing_error(row, filing_path)
-
-        # Create company info record
-        company_info = CompanyInfo()
-        company_info.company = company
-        company_info.name = company_name
-        company_info.sic = None
-        company_info.state_incorporation = None
-        company_info.state_location = None
-        company_info.date = date_filed
-        company_info.save()
-
-    # Finally update company and save
-    filing.company = company
-    filing.save()
-    return True
+            active_fetchers = fetch_workers
+            while active_fetchers > 0 and not stop_event.is_set():
+                # Wake periodically, since stopped fetchers may never queue their end marker
+                try:
+                    item = fetch_queue.get(timeout=openedgar.clients.openedgar.PIPELINE_POLL_INTERVAL)
+                except queue.Empty:
+                    continue
+                if item is None:
+                    active_fetchers -= 1
+                    continue
+
+                filing_path, fetched = item
+                if fetched is not None and fetched[2]:
+                    try:
+                        client.put_buffer(filing_path, fetched[0])
+                        logger.info("Downloaded from EDGAR and uploaded to %s...", type(client).__name__)
+                    except Exception as e:  # pylint: disable=broad-except
+                        logger.error("Unable to store filing %s: %s", filing_path, e)
+                        fetched = None
+                openedgar.clients.openedgar.put_unless_stopped(store_queue, (filing_path, fetched), stop_event)
+        except Exception as e:  # pylint: disable=broad-except
+            stage_errors.append(e)
+        finally:
+            openedgar.clients.openedgar.put_unless_stopped(store_queue, None, stop_event)
+
+    stages = [threading.Thread(target=fetch, daemon=True) for _ in range(fetch_workers)]
+    stages.append(threading.Thread(target=store, daemon=True))
+    for stage in stages:
+        stage.start()
+
+    # Parse and record filings as they arrive; database work stays on this thread's connection. If the caller
+    # stops early or processing raises, release the stages rather than leaving them blocked on full queues
+    try:
+        while True:
+            item = store_queue.get()
+            if item is None:
+                break
+
+            filing_path, fetched = item
+            if fetched is None:
+                yield filing_path, False
+                continue
+
+            filing_buffer, filing_sha1, _ = fetched
+            filing_result = process_filing(client, filing_path, filing_buffer, store_raw=store_raw,
+                                           store_text=store_text, filing_sha1=filing_sha1,
+                                           check_existing=check_existing)
+            if filing_result is None:
+                logger.error("Unable to process filing.")
+            yield filing_path, filing_result is not None
+    finally:
+        openedgar.clients.openedgar.stop_pipeline(stop_event, fetch_queue, store_queue)
+
+    # Surface any unexpected stage failure
+    for stage in stages:
+        stage.join()
+    if len(stage_errors) > 0:
+        raise stage_errors[0]
+
+
+@shared_task
+def process_index_filing(client_type: str, filing_path: str, store_raw: bool = False, store_text: bool = False):
+    """
+    Store and process one filing from an index; see process_filing_index.
+    :param client_type: "S3" or local
+    :param filing_path: storage path of the filing, under edgar/
+    :param store_raw:
+    :param store_text:
+    :return: true if the filing was processed
+    """
+    if client_type == "S3":
+        client = S3Client()
+    else:
+        client = LocalClient()
+
+    return fetch_and_process_filing(client, filing_path, store_raw=store_raw, store_text=store_text)
 
 
 @shared_task
 def process_filing_index(client_type: str, file_path: str, filing_index_buffer: Union[str, bytes] = None,
-                         form_type_list: Iterable[str] = None, store_raw: bool = False, store_text: bool = False):
+                         form_type_list: Iterable[str] = None, store_raw: bool = False, store_text: bool = False,
+                         parallel: bool = False):
     """
     Process a filing index from an S3 path or buffer.
     :param file_path: S3 or local path to process; if filing_index_buffer is none, retrieved from here
@@ -291,137 +664,174 @@ def process_filing_index(client_type: str, file_path: str, filing_index_buffer:
     :param form_type_list: optional list of form type to process
     :param store_raw:
     :param store_text:
+    :param parallel: whether to dispatch filings as a Celery chord that records the index once they finish, rather
+    than processing inline; needs a result backend that supports chords
     :return:
     """
     # Log entry
-    logger.info("Processing filing index {0}...".format(file_path))
+    logger.info("Processing filing index %s...", file_path)
+
+    # Without chord support the callback never runs, so the index and its error filings would never be recorded
+    if parallel:
+        check_chord_backend()
 
     if client_type == "S3":
         client = S3Client()
     else:
         client = LocalClient()
 
-    # Retrieve buffer if not passed
+    # Get main filing data structure, parsing in memory since the parser reads the whole index anyway
     if filing_index_buffer is None:
-        logger.info("Retrieving filing index buffer for: {}...".format(file_path))
+        logger.info("Retrieving filing index buffer for: %s...", file_path)
         filing_index_buffer = client.get_buffer(file_path)
+    elif isinstance(filing_index_buffer, str):
+        filing_index_buffer = filing_index_buffer.encode("utf-8")
+    filing_index_data = openedgar.parsers.openedgar.parse_index_buffer(filing_index_buffer, name=file_path)
+    total_record_count = filing_index_data.shape[0]
+    logger.info("Parsed %s records from index", total_record_count)
+
+    # Check for form type whitelist over the whole frame rather than row by row
+    if form_type_list is not None:
+        form_type_mask = filing_index_data["Form Type"].isin(list(form_type_list))
+        logger.info("Skipping %s filings with form types outside the whitelist...", int((~form_type_mask).sum()))
+        filing_index_data = filing_index_data.loc[form_type_mask]
+
+    # For inline processing, load the index's companies up front
+    if not parallel:
+        warm_company_cache(filing_index_data["CIK"].dropna().unique())
+
+    # Look up already-recorded filings in a few batched queries rather than per row
+    filing_paths = get_filing_paths(filing_index_data["File Name"])
+    existing_paths = get_existing_filing_paths(filing_paths.dropna().unique().tolist())
+
+    # Iterate through rows, collecting filings to process inline or as tasks dispatched together
+    failed_rows = []
+    pending_rows = {}
+    job_rows = []
+    job_signatures = []
+    index_columns = [filing_index_data[column].tolist()
+                     for column in ("CIK", "Company Name", "Form Type", "Date Filed", "File Name")]
+    for cik, company_name, form_type, date_filed, file_name, filing_path in zip(*index_columns,
+                                                                                filing_paths.tolist()):
+        # Skip names outside the archive layout
+        if not isinstance(filing_path, str):
+            logger.error("Unable to build path for %s, skipping...", file_name)
+            continue
 
-    # Write to disk to handle headaches
-    temp_file = tempfile.NamedTemporaryFile(delete=False)
-    temp_file.write(filing_index_buffer)
-    temp_file.close()
+        # Check if filing record exists
+        if filing_path in existing_paths:
+            logger.info("Filing record already exists: %s", filing_path)
+            continue
 
-    # Get main filing data structure
-    filing_index_data = openedgar.parsers.openedgar.parse_index_file(temp_file.name)
-    logger.info("Parsed {0} records from index".format(filing_index_data.shape[0]))
-
-    # Iterate through rows
-    bad_record_count = 0
-    for _, row in filing_index_data.iterrows():
-        # Check for form type whitelist
-        if form_type_list is not None:
-            if row["Form Type"] not in form_type_list:
-                logger.info("Skipping filing {0} with form type {1}...".format(row["File Name"], row["Form Type"]))
-                continue
+        # Create new filing record
+        logger.info("No Filing record found for %s, creating...", filing_path)
+        existing_paths.add(filing_path)
+        row = (cik, company_name, form_type, date_filed, filing_path)
+        if parallel:
+            job_rows.append(row)
+            job_signatures.append(process_index_filing.s(client_type, filing_path, store_raw=store_raw,
+                                                         store_text=store_text))
+        else:
+            pending_rows[filing_path] = row
 
-        # Cleanup path
-        if row["File Name"].lower().startswith("data/"):
-            filing_path = "edgar/{0}".format(row["File Name"])
-        elif row["File Name"].lower().startswith("edgar/"):
-            filing_path = row["File Name"]
+    # Process inline filings through the fetch/store/process pipeline
+    if pending_rows:
+        # Paths were just checked against existing Filing records, so skip the per-filing check
+        for filing_path, is_processed in fetch_and_process_filings(client, list(pending_rows), store_raw=store_raw,
+                                                                   store_text=store_text, check_existing=False):
+            if not is_processed:
+                failed_rows.append(pending_rows[filing_path])
 
-        # Check if filing record exists
-        try:
-            filing = Filing.objects.get(s3_path=filing_path)
-            logger.info("Filing record already exists: {0}".format(filing))
-        except Filing.MultipleObjectsReturned as e:
-            # Create new filing record
-            logger.error("Multiple Filing records found for s3_path={0}, skipping...".format(filing_path))
-            logger.info("Raw exception: {0}".format(e))
-            continue
-        except Filing.DoesNotExist as f:
-            # Create new filing record
-            logger.info("No Filing record found for {0}, creating...".format(filing_path))
-            logger.info("Raw exception: {0}".format(f))
-
-            # Check if exists; download and upload to S3 if missing
-            if not client.path_exists(filing_path):
-                # Download
-                try:
-                    filing_buffer, _ = openedgar.clients.openedgar.get_buffer("/Archives/{0}".format(filing_path))
-                except RuntimeError as g:
-                    logger.error("Unable to access resource {0} from EDGAR: {1}".format(filing_path, g))
-                    bad_record_count += 1
-                    create_filing_error(row, filing_path)
-                    continue
+    # Dispatch filings without waiting on them here; each task builds its own client, and the callback records
+    # their failures and the index once every task has finished
+    if job_signatures:
+        logger.info("Dispatching %s filings...", len(job_signatures))
+        celery.chord(job_signatures)(record_filing_index_results.s(file_path, total_record_count, job_rows))
+        return
 
-                # Upload
-                client.put_buffer(filing_path, filing_buffer)
+    record_filing_index(file_path, total_record_count, failed_rows)
 
-                logger.info("Downloaded from EDGAR and uploaded to {}...".format(client_type))
-            else:
-                # Download
-                logger.info("File already stored on {}, retrieving and processing...".format(client_type))
-                filing_buffer = client.get_buffer(filing_path)
 
-            # Parse
-            filing_result = process_filing(client, filing_path, filing_buffer, store_raw=store_raw, store_text=store_text)
-            if filing_result is None:
-                logger.error("Unable to process filing.")
-                bad_record_count += 1
-                create_filing_error(row, filing_path)
+def check_chord_backend(backend=None):
+    """
+    Check that a Celery result backend supports chords, as parallel index processing needs.
+    :param backend: result backend; defaults to the current app's
+    :return:
+    """
+    if backend is None:
+        backend = celery.current_app.backend
 
-    # Create a filing index record
+    # The rpc backend never reports subtask results to the chord unlock, and the disabled backend stores none
+    if isinstance(backend, (celery.backends.rpc.RPCBackend, celery.backends.base.DisabledBackend)):
+        raise RuntimeError("Parallel filing index processing needs a result backend that supports chords, "
+                           "not {0}; set CELERY_RESULT_BACKEND, e.g., to a redis:// URL".format(type(backend).__name__))
+
+
+@shared_task
+def record_filing_index_results(job_results: list, file_path: str, total_record_count: int, job_rows: list):
+    """
+    Chord callback for filings dispatched by process_filing_index; records failed filings and the index.
+    :param job_results: whether each dispatched filing was processed, in dispatch order
+    :param file_path: S3 or local path of the index
+    :param total_record_count: number of records in the index
+    :param job_rows: index row fields of each dispatched filing, in dispatch order
+    :return:
+    """
+    failed_rows = [row for row, is_processed in zip(job_rows, job_results) if not is_processed]
+    record_filing_index(file_path, total_record_count, failed_rows)
+
+
+def record_filing_index(file_path: str, total_record_count: int, failed_rows: list):
+    """
+    Create error records for filings that failed and create or refresh the filing index record.
+    :param file_path: S3 or local path of the index
+    :param total_record_count: number of records in the index
+    :param failed_rows: index row fields of each failed filing; see create_filing_error
+    :return:
+    """
+    # Create error records in batches
+    bad_record_count = len(failed_rows)
+    error_companies = {}
+    error_filings = []
+    for row in failed_rows:
+        company, filing = create_filing_error(*row)
+        error_companies.setdefault(company.cik, company)
+        error_filings.append(filing)
+        if len(error_filings) >= FILING_ERROR_BATCH_SIZE:
+            flush_filing_errors(error_companies, error_filings)
+    flush_filing_errors(error_companies, error_filings)
+
+    # Create or refresh the filing index record in a single upsert
     edgar_url = "/Archives/{0}".format(file_path).replace("//", "/")
-    try:
-        filing_index = FilingIndex.objects.get(edgar_url=edgar_url)
-        filing_index.total_record_count = filing_index_data.shape[0]
-        filing_index.bad_record_count = bad_record_count
-        filing_index.is_processed = True
-        filing_index.is_error = False
-        filing_index.save()
-        logger.info("Updated existing filing index record.")
-    except FilingIndex.DoesNotExist:
-        filing_index = FilingIndex()
-        filing_index.edgar_url = edgar_url
-        filing_index.date_published = None
-        filing_index.date_downloaded = datetime.date.today()
-        filing_index.total_record_count = filing_index_data.shape[0]
-        filing_index.bad_record_count = bad_record_count
-        filing_index.is_processed = True
-        filing_index.is_error = False
-        filing_index.save()
-        logger.info("Created new filing index record.")
-
-    # Delete file if we make it this far
-    os.remove(temp_file.name)
+    filing_index = FilingIndex(edgar_url=edgar_url, date_published=None, date_downloaded=datetime.date.today(),
+                               total_record_count=total_record_count, bad_record_count=bad_record_count,
+                               is_processed=True, is_error=False)
+    FilingIndex.objects.bulk_create([filing_index], update_conflicts=True, unique_fields=["edgar_url"],
+                                    update_fields=["total_record_count", "bad_record_count", "is_processed",
+                                                   "is_error"])
+    logger.info("Stored filing index record.")
 
 
 @shared_task
 def process_filing(client, file_path: str, filing_buffer: Union[str, bytes] = None, store_raw: bool = False,
-                   store_text: bool = False):
+                   store_text: bool = False, filing_sha1: bytes = None, check_existing: bool = True):
     """
     Process a filing from a path or filing buffer.
     :param file_path: path to process; if filing_buffer is none, retrieved from here
     :param filing_buffer: buffer; if not present, s3_path must be set
     :param store_raw:
     :param store_text:
+    :param filing_sha1: sha1 digest of filing_buffer if already computed
+    :param check_existing: whether to check for an existing Filing record first; callers that have just
+    checked, e.g., process_filing_index, pass False
     :return:
     """
     # Log entry
-    logger.info("Processing filing {0}...".format(file_path))
-
+    logger.info("Processing filing %s...", file_path)
 
-    # Check for existing record first
-    try:
-        filing = Filing.objects.get(s3_path=file_path)
-        if filing is not None:
-            logger.error("Filing {0} has already been created in record {1}".format(file_path, filing))
-            return None
-    except Filing.DoesNotExist:
-        logger.info("No existing record found.")
-    except Filing.MultipleObjectsReturned:
-        logger.error("Multiple existing record found.")
+    # Check for existing record first, without fetching it
+    if check_existing and Filing.objects.filter(s3_path=file_path).exists():
+        logger.error("Filing %s has already been created", file_path)
         return None
 
     # Get buffer
@@ -429,89 +839,47 @@ def process_filing(client, file_path: str, filing_buffer: Union[str, bytes] = No
         logger.info("Retrieving filing buffer from S3...")
         filing_buffer = client.get_buffer(file_path)
 
+    # Hash in the background while parsing; hashlib releases the GIL on large buffers
+    if filing_sha1 is None:
+        sha1_future = _HASH_EXECUTOR.submit(lambda: hashlib.sha1(filing_buffer, usedforsecurity=False).digest())
+    else:
+        sha1_future = None
+
     # Get main filing data structure
-    filing_data = openedgar.parsers.openedgar.parse_filing(filing_buffer, extract=store_text)
+    filing_data = openedgar.parsers.openedgar.parse_filing(filing_buffer, extract=store_text, lazy=True)
+    if sha1_future is not None:
+        filing_sha1 = sha1_future.result()
     if filing_data["cik"] is None:
-        logger.error("Unable to parse CIK from filing {0}; assuming broken and halting...".format(file_path))
+        logger.error("Unable to parse CIK from filing %s; assuming broken and halting...", file_path)
         return None
 
-    try:
-        # Get company
-        company = Company.objects.get(cik=filing_data["cik"])
-        logger.info("Found existing company record.")
-
-        # Check if record exists for date
-        try:
-            _ = CompanyInfo.objects.get(company=company, date=filing_data["date_filed"])
-
-            logger.info("Found existing company info record.")
-        except CompanyInfo.DoesNotExist:
-            # Create company info record
-            company_info = CompanyInfo()
-            company_info.company = company
-            company_info.name = filing_data["company_name"]
-            company_info.sic = filing_data["sic"]
-            company_info.state_incorporation = filing_data["state_incorporation"]
-            company_info.state_location = filing_data["state_location"]
-            company_info.date = filing_data["date_filed"].date() if isinstance(filing_data["date_filed"],
-                                                                               datetime.datetime) else \
-                filing_data["date_filed"]
-            company_info.save()
-
-            logger.info("Created new company info record.")
-
-    except Company.DoesNotExist:
-        # Create company
-        company = Company()
-        company.cik = filing_data["cik"]
-
-        try:
-            # Catch race with another task/thread
-            company.save()
-
-            try:
-                _ = CompanyInfo.objects.get(company=company, date=filing_data["date_filed"])
-            except CompanyInfo.DoesNotExist:
-                # Create company info record
-                company_info = CompanyInfo()
-                company_info.company = company
-                company_info.name = filing_data["company_name"]
-                company_info.sic = filing_data["sic"]
-                company_info.state_incorporation = filing_data["state_incorporation"]
-                company_info.state_location = filing_data["state_location"]
-                company_info.date = filing_data["date_filed"]
-                company_info.save()
-        except django.db.utils.IntegrityError:
-            company = Company.objects.get(cik=filing_data["cik"])
-
-        logger.info("Created company and company info records.")
+    # Get company, created if missing
+    company = get_company(filing_data["cik"], filing_data["company_name"])
 
     # Now create the filing record
     try:
         filing = Filing()
-        filing.form_type = filing_data["form_type"]
-        filing.accession_number = filing_data["accession_number"]
+        filing.form_type_id = FormType.get_id(filing_data["form_type"])
+        filing.accession_number = Filing.parse_accession_number(filing_data["accession_number"])
         filing.date_filed = filing_data["date_filed"]
+        filing.filing_period = Filing.build_filing_period(filing_data["reporting_period"], filing_data["date_filed"])
         filing.document_count = filing_data["document_count"]
         filing.company = company
-        filing.sha1 = hashlib.sha1(filing_buffer).hexdigest()
+        filing.sha1 = filing_sha1
         filing.s3_path = file_path
-        filing.is_processed = False
-        filing.is_error = True
+        filing.state = FilingState.ERROR
         filing.save()
     except Exception as e:  # pylint: disable=broad-except
-        logger.error("Unable to create filing record: {0}".format(e))
+        logger.error("Unable to create filing record: %s", e)
         return None
 
-    # Create filing document records
+    # Create filing document records, marking the filing processed in the same commit
     try:
-        create_filing_documents(client, filing_data["documents"], filing, store_raw=store_raw, store_text=store_text)
-        filing.is_processed = True
-        filing.is_error = False
-        filing.save()
+        create_filing_documents(client, filing_data["documents"], filing, store_raw=store_raw, store_text=store_text,
+                                mark_processed=True)
         return filing
     except Exception as e:  # pylint: disable=broad-except
-        logger.error("Unable to create filing documents for {0}: {1}".format(filing, e))
+        logger.error("Unable to create filing documents for %s: %s", filing, e)
         return None
 
 
@@ -524,15 +892,201 @@ def extract_filing(client, file_path: str, filing_buffer: Union[str, bytes] = No
     :return:
     """
     # Get buffer
-
-
-
     if filing_buffer is None:
         logger.info("Retrieving filing buffer from S3...")
         filing_buffer = client.get_buffer(file_path)
 
-    # Get main filing data structure
-    _ = openedgar.parsers.openedgar.parse_filing(filing_buffer)
+    # Get main filing data structure; the documents are unused, so leave them unparsed rather than
+    # uudecoding and hashing each one
+    _ = openedgar.parsers.openedgar.parse_filing(filing_buffer, extract=False, lazy=True)
+
+
+def get_search_database(patterns: tuple, case_sensitive: bool = True):
+    """
+    Get a compiled hyperscan database for a tuple of literal patterns, compiling it once per thread.
+    :param patterns: non-empty patterns, matched by position
+    :param case_sensitive: whether to match case
+    :return:
+    """
+    databases = getattr(_SEARCH_LOCAL, "databases", None)
+    if databases is None:
+        databases = _SEARCH_LOCAL.databases = {}
+
+    key = (patterns, case_sensitive)
+    if key not in databases:
+        # Report where each match starts so overlapping matches can be skipped
+        flags = hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP | hyperscan.HS_FLAG_SOM_LEFTMOST
+        if not case_sensitive:
+            flags |= hyperscan.HS_FLAG_CASELESS
+        database = hyperscan.Database()
+        database.compile(expressions=[re.escape(pattern).encode("utf-8") for pattern in patterns],
+                         ids=list(range(len(patterns))), elements=len(patterns), flags=[flags] * len(patterns))
+        if len(databases) >= SEARCH_DATABASE_CACHE_SIZE:
+            databases.clear()
+        databases[key] = database
+    return databases[key]
+
+
+def count_terms(text: Union[str, bytes], search_terms: dict, case_sensitive: bool = True):
+    """
+    Count occurrences of each term in a text in a single pass, using hyperscan or else pyahocorasick if installed.
+    Each term counts non-overlapping matches from the left, as str.count does, whichever backend is used.
+    Case-insensitive counts expect lower-case patterns and never case-fold the whole text at once.
+    :param text: text to search, as str or utf-8 bytes
+    :param search_terms: dict of term to the pattern matched for it
+    :param case_sensitive: whether to match case
+    :return: dict of term to count
+    """
+    # Scan utf-8 bytes directly with hyperscan, which handles case itself
+    if hyperscan is not None:
+        counts = dict.fromkeys(search_terms, 0)
+        matched = [(term, pattern) for term, pattern in search_terms.items() if pattern]
+        if not matched:
+            return counts
+
+        # Matches arrive in order of end offset, so a term's match counts only if it starts after its last match
+        match_ends = [0] * len(matched)
+
+        def on_match(pattern_id, start, end, flags, context):
+            if start >= match_ends[pattern_id]:
+                counts[matched[pattern_id][0]] += 1
+                match_ends[pattern_id] = end
+
+        database = get_search_database(tuple(pattern for _, pattern in matched), case_sensitive)
+        database.scan(text if isinstance(text, bytes) else text.encode("utf-8"), match_event_handler=on_match)
+        return counts
+
+    # Exact matches can be counted on the utf-8 bytes without decoding the whole text, since utf-8 never matches
+    # a character's encoding partway through another's
+    if ahocorasick is None and case_sensitive:
+        if isinstance(text, bytes):
+            return {term: text.count(pattern.encode("utf-8")) if pattern else 0
+                    for term, pattern in search_terms.items()}
+        return {term: text.count(pattern) if pattern else 0 for term, pattern in search_terms.items()}
+
+    if isinstance(text, bytes):
+        text = text.decode("utf-8")
+
+    # Fall back to one scan per term
+    if ahocorasick is None:
+        return {term: sum(1 for _ in re.finditer(re.escape(pattern), text, re.IGNORECASE)) if pattern else 0
+                for term, pattern in search_terms.items()}
+
+    # Build automaton over non-empty patterns, each crediting every term that shares it
+    counts = dict.fromkeys(search_terms, 0)
+    pattern_terms = {}
+    for term, pattern in search_terms.items():
+        if pattern:
+            pattern_terms.setdefault(pattern if case_sensitive else pattern.casefold(), []).append(term)
+    if len(pattern_terms) == 0:
+        return counts
+    automaton = ahocorasick.Automaton()
+    for pattern in pattern_terms:
+        automaton.add_word(pattern, (pattern, len(pattern)))
+    automaton.make_automaton()
+
+    # Matches arrive in order of end position, so a pattern's match counts only if it starts after its last match
+    match_ends = dict.fromkeys(pattern_terms, 0)
+    if case_sensitive:
+        for end_index, (pattern, length) in automaton.iter(text):
+            if end_index + 1 - length >= match_ends[pattern]:
+                for term in pattern_terms[pattern]:
+                    counts[term] += 1
+                match_ends[pattern] = end_index + 1
+        return counts
+
+    # Case-fold a chunk at a time, carrying enough of the previous chunk to catch matches across the boundary;
+    # matches ending inside the carried text were already seen. Folding can change a chunk's length (e.g., "İ"),
+    # so positions are tracked in the folded text rather than the original
+    overlap = max(len(pattern) for pattern in pattern_terms) - 1
+    carry = ""
+    folded_length = 0
+    for start in range(0, len(text), SEARCH_CHUNK_SIZE):
+        folded = text[start:start + SEARCH_CHUNK_SIZE].casefold()
+        chunk = carry + folded
+        offset = folded_length - len(carry)
+        for end_index, (pattern, length) in automaton.iter(chunk):
+            if end_index >= len(carry) and offset + end_index + 1 - length >= match_ends[pattern]:
+                for term in pattern_terms[pattern]:
+                    counts[term] += 1
+                match_ends[pattern] = offset + end_index + 1
+        folded_length += len(folded)
+        carry = chunk[max(len(chunk) - overlap, 0):] if overlap > 0 else ""
+    return counts
+
+
+@functools.lru_cache(maxsize=SEARCH_TERM_CACHE_SIZE)
+def get_search_terms(term_list: tuple, case_sensitive: bool = False, stem_search: bool = False):
+    """
+    Map search terms to the patterns matched for them, stemming each term once per query rather than per document.
+    :param term_list: tuple of terms
+    :param case_sensitive: whether to match case
+    :param stem_search: whether to stem terms
+    :return: tuple of (term, pattern) pairs, keyed by the stemmed term for stem searches
+    """
+    # Local imports; LexNLP loads NLTK and its data, so only import it when stemming
+    if stem_search:
+        import lexnlp.nlp.en.tokens
+
+    search_terms = {}
+    for term in term_list:
+        if stem_search:
+            term = lexnlp.nlp.en.tokens.DEFAULT_STEMMER.stem(term)
+        search_terms[term] = term if case_sensitive else term.lower()
+    return tuple(search_terms.items())
+
+
+@functools.lru_cache(maxsize=SEARCH_TERM_CACHE_SIZE)
+def get_search_term_ids(search_query_id: int):
+    """
+    Map a search query's terms to their SearchQueryTerm ids with a single query, cached per process.
+    :param search_query_id:
+    :return: dict of term to id
+    """
+    return dict(SearchQueryTerm.objects.filter(search_query_id=search_query_id).values_list("term", "id"))
+
+
+def get_document_contents(client, sha1: str, token_search: bool = False, stem_search: bool = False):
+    """
+    Get a document's stored text as bytes, or as a Counter of tokens or stems, from a small per-process cache so
+    repeated searches of the same document skip the download and tokenization; callers must not modify it.
+    :param client: storage client
+    :param sha1: sha1 hash of document
+    :param token_search: whether to return tokens
+    :param stem_search: whether to return stems
+    :return:
+    """
+    key = (type(client).__name__, sha1, token_search, stem_search)
+    with _DOCUMENT_LOCK:
+        cached = _DOCUMENT_CACHE.get(key)
+        if cached is not None and time.monotonic() - cached[0] < DOCUMENT_CACHE_TTL:
+            _DOCUMENT_CACHE.move_to_end(key)
+            return cached[1]
+
+    # Get buffer
+    logger.info("Retrieving buffer from S3...")
+    text_s3_path = TEXT_DOCUMENT_PREFIX + sha1
+    document_buffer = client.get_buffer(text_s3_path)
+
+    # Get contents, counting tokens once so searches need not keep or rescan the token list
+    if token_search or stem_search:
+        # Local imports; LexNLP loads NLTK and its data, so only import it when tokenizing
+        import lexnlp.nlp.en.tokens
+
+    if token_search:
+        document_contents = Counter(lexnlp.nlp.en.tokens.get_token_list(document_buffer.decode("utf-8")))
+    elif stem_search:
+        document_contents = Counter(lexnlp.nlp.en.tokens.get_stem_list(document_buffer.decode("utf-8")))
+    else:
+        document_contents = document_buffer
+
+    # Store, evicting the least recently used entry
+    with _DOCUMENT_LOCK:
+        _DOCUMENT_CACHE[key] = (time.monotonic(), document_contents)
+        _DOCUMENT_CACHE.move_to_end(key)
+        while len(_DOCUMENT_CACHE) > DOCUMENT_CACHE_SIZE:
+            _DOCUMENT_CACHE.popitem(last=False)
+    return document_contents
 
 
 @shared_task
@@ -550,63 +1104,48 @@ def search_filing_document_sha1(client, sha1: str, term_list: Iterable[str], sea
     :param case_sensitive:
     :return:
     """
-    # Get buffer
-    logger.info("Retrieving buffer from S3...")
-    text_s3_path = pathlib.Path(S3_DOCUMENT_PATH, "text", sha1).as_posix()
-    document_buffer = client.get_buffer(text_s3_path).decode("utf-8")
-
-    # Check if case
-    if not case_sensitive:
-        document_buffer = document_buffer.lower()
-
     # TODO: Refactor search types
-    # TODO: Cleanup flow for reduced recalc
-    # TODO: Don't search same SHA1 repeatedly, but need to coordinate with calling process
 
-    # Get contents
-    if not token_search and not stem_search:
-        document_contents = document_buffer
-    elif token_search:
-        document_contents = lexnlp.nlp.en.tokens.get_token_list(document_buffer)
-    elif stem_search:
-        document_contents = lexnlp.nlp.en.tokens.get_stem_list(document_buffer)
+    # Get contents, shared with recent searches of the same document in this process
+    document_contents = get_document_contents(client, sha1, token_search=token_search, stem_search=stem_search)
 
-    # For term in term list
-    counts = {}
-    for term in term_list:
-        # term_tokens = lexnlp.nlp.en.tokens.get_token_list(term)
-
-        if stem_search:
-            term = lexnlp.nlp.en.tokens.DEFAULT_STEMMER.stem(term)
+    # Map each term to the form matched against the document, computed once per query in this process
+    search_terms = dict(get_search_terms(tuple(term_list), case_sensitive=case_sensitive, stem_search=stem_search))
 
-        if case_sensitive:
-            counts[term] = document_contents.count(term)
-        else:
-            counts[term] = document_contents.count(term.lower())
+    # Count all terms together rather than rescanning the document per term, keeping only terms that occur
+    if not token_search and not stem_search:
+        counts = count_terms(document_contents, search_terms, case_sensitive=case_sensitive)
+        matched_counts = {term: count for term, count in counts.items() if count > 0}
+    else:
+        token_counts = document_contents
+        if not case_sensitive:
+            # Fold distinct tokens rather than the full token stream
+            token_counts = Counter()
+            for token, count in document_contents.items():
+                token_counts[token.lower()] += count
+        matched_counts = {term: token_counts[pattern] for term, pattern in search_terms.items()
+                          if pattern in token_counts}
+
+    # Look up term records for the query once, refreshing if a term is missing from the cached map
+    term_ids = get_search_term_ids(search_query_id)
+    if any(term not in term_ids for term in matched_counts):
+        get_search_term_ids.cache_clear()
+        term_ids = get_search_term_ids(search_query_id)
 
-    search_query = None
     results = []
-    for term in counts:
-        if counts[term] > 0:
-            # Get search query if empty
-            if search_query is None:
-                search_query = SearchQuery.objects.get(id=search_query_id)
-
-            # Get term
-            search_term = SearchQueryTerm.objects.get(search_query_id=search_query_id, term=term)
-
-            # Create result
-            result = SearchQueryResult()
-            result.search_query = search_query
-            result.filing_document_id = document_id
-            result.term = search_term
-            result.count = counts[term]
-            results.append(result)
+    for term, count in matched_counts.items():
+        if term not in term_ids:
+            logger.error("No search term record for term=%s in search query %s", term, search_query_id)
+            continue
+
+        # Create result
+        results.append(SearchQueryResult(search_query_id=search_query_id, filing_document_id=document_id,
+                                         term_id=term_ids[term], count=count))
 
     # Create if any
     if len(results) > 0:
-        SearchQueryResult.objects.bulk_create(results)
-    logger.info("Found {0} search terms in document sha1={1}".format(len(results), sha1))
+        SearchQueryResult.objects.bulk_create(results, batch_size=BULK_CREATE_BATCH_SIZE, ignore_conflicts=True)
+    logger.info("Found %s search terms in document sha1=%s", len(results), sha1)
     return True
 
 
@@ -620,9 +1159,7 @@ def extract_filing_document_data_sha1(client, sha1: str):
     :return:
     """
     # Get buffer
-    logger.info("Retrieving buffer from S3...")
-    text_s3_path = pathlib.Path(S3_DOCUMENT_PATH, "text", sha1).as_posix()
-    document_buffer = client.get_buffer(text_s3_path).decode("utf-8")
+    document_buffer = get_document_contents(client, sha1)
 
     # TODO: Build your own database here.
     _ = len(document_buffer)
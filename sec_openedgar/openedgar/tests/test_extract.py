@@ -0,0 +1,61 @@
+"""
+MIT License
+
+Copyright (c) 2018 ContraxSuite, LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# Packages
+import pytest
+
+# Project
+from openedgar.parsers.openedgar import extract_text
+
+
+HTML_DOCUMENT = ("<html><head><style>p { color: red; }</style><script>var x=1;</script></head>"
+                 "<body><p>Company’s café</p><script>var y=2;</script></body></html>")
+
+
+@pytest.mark.parametrize("buffer", [HTML_DOCUMENT, HTML_DOCUMENT.encode("utf-8")])
+def test_extract_text_html(buffer):
+    """
+    Test extracting UTF-8 text from HTML without script or style contents.
+    :return:
+    """
+    assert extract_text(buffer, "text/html") == "Company’s café\n"
+
+
+def test_extract_text_html_blocks():
+    """
+    Test that adjacent paragraphs, line breaks and table cells are kept apart.
+    :return:
+    """
+    buffer = ("<html><body><p>Total revenue</p><p>Net income</p>Line one<br>Line two"
+              "<table><tr><td>Revenue</td><td>100</td></tr></table></body></html>")
+    assert extract_text(buffer, "text/html").split() == ["Total", "revenue", "Net", "income", "Line", "one",
+                                                         "Line", "two", "Revenue", "100"]
+
+
+def test_extract_text_plain():
+    """
+    Test decoding plain text documents as UTF-8.
+    :return:
+    """
+    assert extract_text("Company’s café".encode("utf-8"), "text/plain") == "Company’s café"
@@ -0,0 +1,123 @@
+"""
+MIT License
+
+Copyright (c) 2018 ContraxSuite, LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# Libraries
+import datetime
+import gzip
+
+# Packages
+import pandas
+import pytest
+
+# Project
+import openedgar.clients.openedgar
+import openedgar.parsers.openedgar
+
+
+INDEX_ROWS = [("SC 13G/A", "APPLE COMPUTER INC", 320193, "1994-09-30", "edgar/data/320193/0000320193-94-000016.txt"),
+              ("10-K", "AMERICAN EXPRESS CO", 4962, "1994-09-29", "edgar/data/4962/0000004962-94-000010.txt"),
+              ("10-K", "GENERAL ELECTRIC CO", 40545, "1994-09-30", "edgar/data/40545/0000040545-94-000007.txt"),
+              ("8-K", "AMERICAN EXPRESS CO", 4962, "1994-09-29", "edgar/data/4962/0000004962-94-000011.txt")]
+
+
+def build_form_index():
+    """
+    Build a form.idx buffer in the fixed-width layout of the EDGAR full index.
+    :return: index bytes
+    """
+    line_format = "{0:<12}{1:<62}{2:<12}{3:<12}{4}"
+    lines = ["Description:           Master Index of EDGAR Dissemination Feed by Form Type",
+             "Last Data Received:    September 30, 1994",
+             "",
+             "",
+             line_format.format("Form Type", "Company Name", "CIK", "Date Filed", "File Name"),
+             "-" * 140]
+    lines.extend(line_format.format(*row) for row in INDEX_ROWS)
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_parse_index_buffer(compress):
+    """
+    Test parsing a plain or gzip-compressed form index.
+    :return:
+    """
+    buffer = build_form_index()
+    if compress:
+        buffer = gzip.compress(buffer)
+
+    result = openedgar.parsers.openedgar.parse_index_buffer(buffer)
+
+    assert list(result.columns) == ["CIK", "Company Name", "Date Filed", "File Name", "Form Type"]
+    assert result.to_dict("list") == {"CIK": [row[2] for row in INDEX_ROWS],
+                                      "Company Name": [row[1] for row in INDEX_ROWS],
+                                      "Date Filed": [row[3] for row in INDEX_ROWS],
+                                      "File Name": [row[4] for row in INDEX_ROWS],
+                                      "Form Type": [row[0] for row in INDEX_ROWS]}
+
+
+def test_parse_index_buffer_categories():
+    """
+    Test that repeated form types and filing dates are stored as categoricals.
+    :return:
+    """
+    result = openedgar.parsers.openedgar.parse_index_buffer(gzip.compress(build_form_index()))
+
+    assert isinstance(result["Form Type"].dtype, pandas.CategoricalDtype)
+    assert isinstance(result["Date Filed"].dtype, pandas.CategoricalDtype)
+    assert sorted(result["Form Type"].cat.categories) == ["10-K", "8-K", "SC 13G/A"]
+
+
+def test_parse_index_buffer_invalid():
+    """
+    Test that an undecodable buffer yields an empty index.
+    :return:
+    """
+    result = openedgar.parsers.openedgar.parse_index_buffer(b"\xff\xfe\x00not an index")
+
+    assert result.empty
+
+
+def test_get_index_paths():
+    """
+    Test building one quarterly index path per quarter of each year.
+    :return:
+    """
+    result = openedgar.clients.openedgar.get_index_paths(1994, 1995)
+
+    assert len(result) == 8
+    assert result[0] == "/Archives/edgar/full-index/1994/QTR1/form.gz"
+    assert result[-1] == "/Archives/edgar/full-index/1995/QTR4/form.gz"
+
+
+def test_get_index_paths_current_year():
+    """
+    Test that index paths stop at the current quarter and start no earlier than EDGAR.
+    :return:
+    """
+    today = datetime.date.today()
+    result = openedgar.clients.openedgar.get_index_paths(1990, today.year + 1)
+
+    assert result[0] == "/Archives/edgar/full-index/1994/QTR1/form.gz"
+    assert result[-1] == "/Archives/edgar/full-index/{0}/QTR{1}/form.gz".format(today.year, (today.month - 1) // 3 + 1)
@@ -0,0 +1,77 @@
+"""
+MIT License
+
+Copyright (c) 2018 ContraxSuite, LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# Packages
+import django.db
+import pytest
+
+# Project
+from openedgar.models import Filing, FilingDocument
+
+
+def make_document_record(filing, sequence, description):
+    """
+    Build a FilingDocument record with its required fields; COPY fills the rest from field defaults.
+    :param filing: filing the document belongs to
+    :param sequence: document sequence number
+    :param description: document description
+    :return: record dict
+    """
+    return {"filing_id": filing.id, "sequence": sequence, "description": description, "sha1": bytes(20),
+            "start_pos": 0, "end_pos": 10}
+
+
+@pytest.mark.django_db
+def test_bulk_copy_insert_batches():
+    """
+    Test that bulk_copy_insert loads every batch and skips records that already exist.
+    :return:
+    """
+    filing = Filing.objects.create(s3_path="edgar/data/1/0000000001-18-000001.txt")
+    records = [make_document_record(filing, sequence, "first") for sequence in range(3)]
+
+    # Each batch runs in a savepoint of the caller's transaction
+    with django.db.transaction.atomic():
+        assert FilingDocument.bulk_copy_insert(records, batch_size=1) == 3
+        assert FilingDocument.bulk_copy_insert(records, batch_size=2) == 0
+
+    assert sorted(FilingDocument.objects.filter(filing=filing).values_list("sequence", flat=True)) == [0, 1, 2]
+
+
+@pytest.mark.django_db
+def test_bulk_copy_insert_update():
+    """
+    Test that bulk_copy_insert updates conflicting records and inserts new ones when given update fields.
+    :return:
+    """
+    filing = Filing.objects.create(s3_path="edgar/data/1/0000000001-18-000001.txt")
+    FilingDocument.bulk_copy_insert([make_document_record(filing, sequence, "first") for sequence in range(2)])
+
+    records = [make_document_record(filing, sequence, "second") for sequence in range(3)]
+    with django.db.transaction.atomic():
+        assert FilingDocument.bulk_copy_insert(records, batch_size=2, unique_fields=("filing", "sequence"),
+                                               update_fields=("description",)) == 3
+
+    assert list(FilingDocument.objects.filter(filing=filing).order_by("sequence")
+                .values_list("description", flat=True)) == ["second", "second", "second"]
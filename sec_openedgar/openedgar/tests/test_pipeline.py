@@ -0,0 +1,194 @@
+"""
+MIT License
+
+Copyright (c) 2018 ContraxSuite, LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# Libraries
+import threading
+import time
+
+# Packages
+import pytest
+
+# Project
+import openedgar.clients.openedgar
+import openedgar.tasks
+
+
+class RecordingClient:
+    """
+    Storage client stand-in that keeps stored buffers in memory.
+    """
+
+    def __init__(self):
+        self.buffers = {}
+
+    def put_buffer(self, file_path: str, buffer, write_bytes=True):
+        self.buffers[file_path] = buffer
+
+
+def wait_for_threads(thread_count: int, timeout: float = 5.0):
+    """
+    Wait until no more than thread_count threads are running.
+    :param thread_count: expected number of threads
+    :param timeout: seconds to wait
+    :return: whether the count was reached
+    """
+    deadline = time.monotonic() + timeout
+    while threading.active_count() > thread_count:
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+def test_store_buffers(monkeypatch):
+    """
+    Test that every retrieved path is stored and reported.
+    :return:
+    """
+    monkeypatch.setattr(openedgar.clients.openedgar, "get_buffer",
+                        lambda remote_path: (remote_path.encode("utf-8"), None))
+    client = RecordingClient()
+    path_pairs = [("/Archives/{0}".format(i), "edgar/{0}".format(i)) for i in range(20)]
+
+    results = list(openedgar.clients.openedgar.store_buffers(path_pairs, client, queue_size=2, max_workers=3))
+
+    assert sorted(results) == sorted((remote, local, True) for remote, local in path_pairs)
+    assert client.buffers == {local: remote.encode("utf-8") for remote, local in path_pairs}
+
+
+def test_store_buffers_missing(monkeypatch):
+    """
+    Test that paths EDGAR does not serve are reported as failures without being stored.
+    :return:
+    """
+    def get_buffer(remote_path):
+        raise RuntimeError("HTTP 404 for requested path")
+
+    monkeypatch.setattr(openedgar.clients.openedgar, "get_buffer", get_buffer)
+    client = RecordingClient()
+
+    results = list(openedgar.clients.openedgar.store_buffers([("/Archives/a", "edgar/a")], client))
+
+    assert results == [("/Archives/a", "edgar/a", False)]
+    assert client.buffers == {}
+
+
+def test_store_buffers_stopped_early(monkeypatch):
+    """
+    Test that downloaders exit when the caller stops iterating with buffers still queued.
+    :return:
+    """
+    monkeypatch.setattr(openedgar.clients.openedgar, "get_buffer", lambda remote_path: (b"x", None))
+    thread_count = threading.active_count()
+    path_pairs = [("/Archives/{0}".format(i), "edgar/{0}".format(i)) for i in range(100)]
+
+    results = openedgar.clients.openedgar.store_buffers(path_pairs, RecordingClient(), queue_size=1, max_workers=4)
+    next(results)
+    results.close()
+
+    assert wait_for_threads(thread_count)
+
+
+def test_store_buffers_store_error(monkeypatch):
+    """
+    Test that downloaders exit when storing a buffer fails.
+    :return:
+    """
+    class FailingClient:
+        def put_buffer(self, file_path: str, buffer, write_bytes=True):
+            raise OSError("disk full")
+
+    monkeypatch.setattr(openedgar.clients.openedgar, "get_buffer", lambda remote_path: (b"x", None))
+    thread_count = threading.active_count()
+    path_pairs = [("/Archives/{0}".format(i), "edgar/{0}".format(i)) for i in range(100)]
+
+    with pytest.raises(OSError):
+        list(openedgar.clients.openedgar.store_buffers(path_pairs, FailingClient(), queue_size=1, max_workers=4))
+    assert wait_for_threads(thread_count)
+
+
+def test_fetch_and_process_filings(monkeypatch):
+    """
+    Test that fetched filings are stored if downloaded, processed, and reported.
+    :return:
+    """
+    def fetch_filing(client, filing_path):
+        if filing_path.endswith("missing.txt"):
+            return None
+        return filing_path.encode("utf-8"), None, filing_path.endswith("new.txt")
+
+    processed_paths = []
+
+    def process_filing(client, filing_path, filing_buffer, **kwargs):
+        processed_paths.append(filing_path)
+        return filing_path
+
+    monkeypatch.setattr(openedgar.tasks, "fetch_filing", fetch_filing)
+    monkeypatch.setattr(openedgar.tasks, "process_filing", process_filing)
+    client = RecordingClient()
+    filing_paths = ["edgar/data/1/stored.txt", "edgar/data/2/new.txt", "edgar/data/3/missing.txt"]
+
+    results = list(openedgar.tasks.fetch_and_process_filings(client, filing_paths, queue_size=1, fetch_workers=2))
+
+    assert sorted(results) == [("edgar/data/1/stored.txt", True), ("edgar/data/2/new.txt", True),
+                               ("edgar/data/3/missing.txt", False)]
+    assert sorted(processed_paths) == ["edgar/data/1/stored.txt", "edgar/data/2/new.txt"]
+    assert client.buffers == {"edgar/data/2/new.txt": b"edgar/data/2/new.txt"}
+
+
+def test_fetch_and_process_filings_stopped_early(monkeypatch):
+    """
+    Test that the fetch and store stages exit when the caller stops iterating with filings still queued.
+    :return:
+    """
+    monkeypatch.setattr(openedgar.tasks, "fetch_filing", lambda client, filing_path: (b"x", None, True))
+    monkeypatch.setattr(openedgar.tasks, "process_filing", lambda client, filing_path, filing_buffer, **kwargs: True)
+    thread_count = threading.active_count()
+    filing_paths = ["edgar/data/{0}.txt".format(i) for i in range(100)]
+
+    results = openedgar.tasks.fetch_and_process_filings(RecordingClient(), filing_paths, queue_size=1,
+                                                        fetch_workers=4)
+    next(results)
+    results.close()
+
+    assert wait_for_threads(thread_count)
+
+
+def test_fetch_and_process_filings_process_error(monkeypatch):
+    """
+    Test that the fetch and store stages exit when processing raises outside of process_filing's own handling.
+    :return:
+    """
+    def process_filing(client, filing_path, filing_buffer, **kwargs):
+        raise ValueError("unparseable filing")
+
+    monkeypatch.setattr(openedgar.tasks, "fetch_filing", lambda client, filing_path: (b"x", None, True))
+    monkeypatch.setattr(openedgar.tasks, "process_filing", process_filing)
+    thread_count = threading.active_count()
+    filing_paths = ["edgar/data/{0}.txt".format(i) for i in range(100)]
+
+    with pytest.raises(ValueError):
+        list(openedgar.tasks.fetch_and_process_filings(RecordingClient(), filing_paths, queue_size=1,
+                                                       fetch_workers=4))
+    assert wait_for_threads(thread_count)
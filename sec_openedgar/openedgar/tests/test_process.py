@@ -22,7 +22,16 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import csv
+import datetime
+
+import celery
+import pytest
+
 from openedgar.clients.s3 import S3Client
+from openedgar.models import Company, CompanyInfo, Filing, FilingDocument, FormType, SearchQuery, \
+    SearchQueryResult, SearchQueryTerm
+from openedgar.processes.edgar import export_filing_document_search
 import openedgar.tasks
 from config.settings.base import S3_BUCKET
 
@@ -38,3 +47,57 @@ def test_process_filing():
         client = S3Client()
         buffer = client.get_buffer("edgar/data/1000180/0000950134-05-005462.txt")
         openedgar.tasks.process_filing(buffer)
+
+
+@pytest.mark.parametrize("backend_url", ["rpc://", "disabled://"])
+def test_check_chord_backend_unsupported(backend_url):
+    """
+    Test that parallel index processing refuses result backends without chord support.
+    :return:
+    """
+    app = celery.Celery(backend=backend_url, set_as_current=False)
+    with pytest.raises(RuntimeError):
+        openedgar.tasks.check_chord_backend(app.backend)
+
+
+def test_check_chord_backend_supported():
+    """
+    Test that a key-value result backend passes the chord check.
+    :return:
+    """
+    app = celery.Celery(backend="cache+memory://", set_as_current=False)
+    openedgar.tasks.check_chord_backend(app.backend)
+
+
+@pytest.mark.django_db
+def test_export_filing_document_search(tmp_path):
+    """
+    Test that a search export joins results to their filing, form type, and the company info current on the
+    filing date.
+    :return:
+    """
+    date_filed = datetime.date(2018, 1, 2)
+    company = Company.objects.create(cik=1000180, cik_name="SANDISK CORP")
+    for name, business_state, asof in [("SANDISK INC", "NY", datetime.date(2016, 3, 1)),
+                                       ("SANDISK CORP", "CA", datetime.date(2017, 6, 30)),
+                                       ("SANDISK LLC", "NV", datetime.date(2019, 5, 1))]:
+        CompanyInfo.objects.create(cik=company, name=name, is_company=True, business_state=business_state,
+                                   insider_transaction_for_owner_exists=0, insider_transaction_for_issuer_exists=0,
+                                   asof=asof)
+    filing = Filing.objects.create(form_type=FormType.objects.create(name="10-K"), accession_number=95013405005462,
+                                   date_filed=date_filed, company=company,
+                                   s3_path="edgar/data/1000180/0000950134-05-005462.txt")
+    filing_document = FilingDocument.objects.create(filing=filing, sequence=1, description="annual report",
+                                                    sha1=bytes(20), start_pos=0, end_pos=10)
+    search_query = SearchQuery.objects.create(form_type="10-K")
+    term = SearchQueryTerm.objects.create(search_query=search_query, term="revenue")
+    SearchQueryResult.objects.create(search_query=search_query, filing_document=filing_document, term=term, count=3)
+
+    output_path = tmp_path / "export.csv"
+    export_filing_document_search(search_query.id, str(output_path))
+
+    with open(output_path, encoding="utf-8", newline="") as output_file:
+        rows = list(csv.DictReader(output_file))
+    assert rows == [{"accession_number": "0000950134-05-005462", "date_filed": "2018-01-02", "company_id": "1000180",
+                     "name": "SANDISK CORP", "sic": "", "state_location": "CA", "form_type": "10-K", "sequence": "1",
+                     "description": "annual report", "sha1": "0" * 40, "term": "revenue", "count": "3"}]
@@ -0,0 +1,116 @@
+"""
+MIT License
+
+Copyright (c) 2018 ContraxSuite, LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# Packages
+import pytest
+
+# Project
+import openedgar.tasks
+
+# Texts and terms where matches of one term overlap each other or another term's
+COUNT_CASES = [
+    ("aaaa", {"aa": "aa"}, {"aa": 2}),
+    ("aaaaa", {"aaa": "aaa", "a": "a"}, {"aaa": 1, "a": 5}),
+    ("abcabcabc", {"abc": "abc", "bca": "bca", "cab": "cab"}, {"abc": 3, "bca": 2, "cab": 2}),
+    ("the company's company", {"company": "company", "missing": "missing", "empty": ""},
+     {"company": 2, "missing": 0, "empty": 0}),
+    ("café caféé", {"éé": "éé", "café": "café"},
+     {"éé": 1, "café": 2}),
+]
+
+
+@pytest.fixture(params=["str.count", "ahocorasick", "hyperscan"])
+def search_backend(request, monkeypatch):
+    """
+    Run a test against each count_terms backend, skipping those not installed.
+    :return:
+    """
+    if request.param == "str.count":
+        monkeypatch.setattr(openedgar.tasks, "hyperscan", None)
+        monkeypatch.setattr(openedgar.tasks, "ahocorasick", None)
+    elif request.param == "ahocorasick":
+        pytest.importorskip("ahocorasick")
+        monkeypatch.setattr(openedgar.tasks, "hyperscan", None)
+    else:
+        pytest.importorskip("hyperscan")
+    return request.param
+
+
+@pytest.mark.parametrize("text, search_terms, expected", COUNT_CASES)
+def test_count_terms(search_backend, text, search_terms, expected):
+    """
+    Test case-sensitive counts over str and bytes match str.count.
+    :return:
+    """
+    assert openedgar.tasks.count_terms(text, search_terms) == expected
+    assert openedgar.tasks.count_terms(text.encode("utf-8"), search_terms) == expected
+
+
+@pytest.mark.parametrize("text, search_terms, expected", COUNT_CASES)
+def test_count_terms_case_insensitive(search_backend, text, search_terms, expected):
+    """
+    Test case-insensitive counts over upper-cased text match str.count on the lower-cased text.
+    :return:
+    """
+    assert openedgar.tasks.count_terms(text.upper(), search_terms, case_sensitive=False) == expected
+    assert openedgar.tasks.count_terms(text.upper().encode("utf-8"), search_terms, case_sensitive=False) == expected
+
+
+def test_count_terms_chunk_boundary(search_backend, monkeypatch):
+    """
+    Test case-insensitive counts when matches and overlapping candidates cross chunk boundaries.
+    :return:
+    """
+    monkeypatch.setattr(openedgar.tasks, "SEARCH_CHUNK_SIZE", 3)
+    text = "AAAAAAA xABCABCx ABAB"
+    search_terms = {"aa": "aa", "abcabc": "abcabc", "bca": "bca", "aba": "aba"}
+    expected = {term: text.lower().count(pattern) for term, pattern in search_terms.items()}
+
+    assert openedgar.tasks.count_terms(text, search_terms, case_sensitive=False) == expected
+
+
+def test_count_terms_chunk_length_change(search_backend, monkeypatch):
+    """
+    Test case-insensitive counts across chunk boundaries when folding case lengthens the text, as "İ" does.
+    :return:
+    """
+    monkeypatch.setattr(openedgar.tasks, "SEARCH_CHUNK_SIZE", 3)
+    text = "İAAAA İİAAAAAA xİAB"
+    search_terms = {"aa": "aa", "ab": "ab"}
+    expected = {term: text.lower().count(pattern) for term, pattern in search_terms.items()}
+
+    assert openedgar.tasks.count_terms(text, search_terms, case_sensitive=False) == expected
+
+
+@pytest.mark.parametrize("text, search_terms, case_sensitive, expected", [
+    ("Foo foo FOO", {"Foo": "foo", "foo": "foo"}, False, {"Foo": 3, "foo": 3}),
+    ("revenue and revenues", {"revenue": "revenue", "sales": "revenue", "income": "income"}, True,
+     {"revenue": 2, "sales": 2, "income": 0}),
+])
+def test_count_terms_shared_pattern(search_backend, text, search_terms, case_sensitive, expected):
+    """
+    Test that terms sharing a pattern are each counted.
+    :return:
+    """
+    assert openedgar.tasks.count_terms(text, search_terms, case_sensitive=case_sensitive) == expected